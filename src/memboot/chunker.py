@@ -3,33 +3,56 @@
 from __future__ import annotations
 
 import ast
+import json
 import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import accumulate
 from pathlib import Path
+from typing import cast
 
-import yaml
+import numpy as np
 
 from memboot.exceptions import ChunkError
 from memboot.models import ChunkType, MembootConfig
 
+_HEADER_RE = re.compile(r"^(#{1,3})\s+(.+)$")
+_YAML_KEY_RE = re.compile(r"^(\S+)\s*:")
 
+# json.dumps(..., indent=2) builds a new encoder per call; share one across keys
+_JSON_ENCODER = json.JSONEncoder(indent=2)
+
+# Top-level Python node types that become chunks, keyed by exact type for O(1) dispatch
+_FUNC_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_PY_NODE_KINDS: dict[type[ast.AST], ChunkType] = {
+    ast.FunctionDef: ChunkType.FUNCTION,
+    ast.AsyncFunctionDef: ChunkType.FUNCTION,
+    ast.ClassDef: ChunkType.CLASS,
+}
+
+
+@dataclass(slots=True)
 class ChunkResult:
     """Result from chunking a file."""
 
-    __slots__ = ("content", "chunk_type", "start_line", "end_line", "metadata")
+    content: str
+    chunk_type: ChunkType
+    start_line: int
+    end_line: int
+    metadata: dict[str, str] = field(default_factory=dict)
+
 
-    def __init__(
-        self,
-        content: str,
-        chunk_type: ChunkType,
-        start_line: int,
-        end_line: int,
-        metadata: dict[str, str] | None = None,
-    ) -> None:
-        self.content = content
-        self.chunk_type = chunk_type
-        self.start_line = start_line
-        self.end_line = end_line
-        self.metadata = metadata or {}
+def _newline_offsets(content: str) -> np.ndarray:
+    """Character offsets of every newline in content, in ascending order."""
+    # UTF-32 has one fixed-width code unit per character, so array indices are
+    # character offsets; the scan runs over a zero-copy view of the encoded buffer.
+    codes = np.frombuffer(content.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    return np.flatnonzero(codes == 0x0A)
+
+
+def _line_at(newlines: np.ndarray, offset: int) -> int:
+    """1-based line number of the character at offset."""
+    return int(np.searchsorted(newlines, offset)) + 1
 
 
 def chunk_file(file_path: Path, config: MembootConfig | None = None) -> list[ChunkResult]:
@@ -64,14 +87,20 @@ def _chunk_python(content: str, config: MembootConfig) -> list[ChunkResult]:
         return _chunk_window(content, config)
 
     lines = content.splitlines(keepends=True)
+    # offsets[n] is the character offset where line n + 1 starts, so lines a..b
+    # (1-based, inclusive) are content[offsets[a - 1] : offsets[b]].
+    offsets = [0, *accumulate(map(len, lines))]
     chunks: list[ChunkResult] = []
-    covered_lines: set[int] = set()
+    covered_ranges: list[tuple[int, int]] = []  # (start, end) of top-level nodes, in order
 
-    for node in ast.iter_child_nodes(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+    node_kind = _PY_NODE_KINDS.get
+    for node in tree.body:
+        kind = node_kind(type(node))
+        if kind is ChunkType.FUNCTION:
+            node = cast(ast.FunctionDef, node)
             start = node.lineno
             end = node.end_lineno or node.lineno
-            chunk_content = "".join(lines[start - 1 : end])
+            chunk_content = content[offsets[start - 1] : offsets[end]]
             chunks.append(
                 ChunkResult(
                     content=chunk_content.rstrip(),
@@ -81,24 +110,20 @@ def _chunk_python(content: str, config: MembootConfig) -> list[ChunkResult]:
                     metadata={"name": node.name},
                 )
             )
-            covered_lines.update(range(start, end + 1))
 
-        elif isinstance(node, ast.ClassDef):
+        elif kind is ChunkType.CLASS:
+            node = cast(ast.ClassDef, node)
             start = node.lineno
             end = node.end_lineno or node.lineno
             # Check if class has methods that should be split
-            methods = [
-                n
-                for n in ast.iter_child_nodes(node)
-                if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
-            ]
+            methods = cast(list[ast.FunctionDef], [n for n in node.body if type(n) in _FUNC_TYPES])
             est_tokens = (end - start + 1) * 4  # rough estimate
             if methods and est_tokens > config.max_chunk_tokens * 4:
                 # Split class into method-level chunks
                 for method in methods:
                     m_start = method.lineno
                     m_end = method.end_lineno or method.lineno
-                    m_content = "".join(lines[m_start - 1 : m_end])
+                    m_content = content[offsets[m_start - 1] : offsets[m_end]]
                     chunks.append(
                         ChunkResult(
                             content=m_content.rstrip(),
@@ -108,11 +133,10 @@ def _chunk_python(content: str, config: MembootConfig) -> list[ChunkResult]:
                             metadata={"class": node.name, "name": method.name},
                         )
                     )
-                    covered_lines.update(range(m_start, m_end + 1))
                 # Also capture class header (docstring, class vars)
-                first_method_line = min(m.lineno for m in methods)
+                first_method_line = methods[0].lineno  # class body is in source order
                 if first_method_line > start + 1:
-                    header = "".join(lines[start - 1 : first_method_line - 1])
+                    header = content[offsets[start - 1] : offsets[first_method_line - 1]]
                     if header.strip():
                         chunks.append(
                             ChunkResult(
@@ -123,9 +147,8 @@ def _chunk_python(content: str, config: MembootConfig) -> list[ChunkResult]:
                                 metadata={"name": node.name},
                             )
                         )
-                covered_lines.update(range(start, end + 1))
             else:
-                chunk_content = "".join(lines[start - 1 : end])
+                chunk_content = content[offsets[start - 1] : offsets[end]]
                 chunks.append(
                     ChunkResult(
                         content=chunk_content.rstrip(),
@@ -135,16 +158,22 @@ def _chunk_python(content: str, config: MembootConfig) -> list[ChunkResult]:
                         metadata={"name": node.name},
                     )
                 )
-                covered_lines.update(range(start, end + 1))
+        else:
+            continue
+        covered_ranges.append((start, end))
 
-    # Capture module-level code not covered by functions/classes
+    # Capture module-level code not covered by functions/classes, visiting only the gaps
     module_lines: list[str] = []
     module_start: int | None = None
-    for i, line in enumerate(lines, 1):
-        if i not in covered_lines and line.strip() and not line.strip().startswith("#"):
-            if module_start is None:
-                module_start = i
-            module_lines.append(line)
+    prev_end = 0
+    for start, end in [*covered_ranges, (len(lines) + 1, len(lines))]:
+        for i, line in enumerate(lines[prev_end : start - 1], prev_end + 1):
+            stripped = line.strip()
+            if stripped and not stripped.startswith("#"):
+                if module_start is None:
+                    module_start = i
+                module_lines.append(line)
+        prev_end = max(prev_end, end)
 
     if module_lines and module_start is not None:
         module_content = "".join(module_lines)
@@ -163,19 +192,18 @@ def _chunk_python(content: str, config: MembootConfig) -> list[ChunkResult]:
 
 def _chunk_markdown(content: str, config: MembootConfig) -> list[ChunkResult]:
     """Split markdown on headers."""
-    header_pattern = re.compile(r"^(#{1,3})\s+(.+)$", re.MULTILINE)
     chunks: list[ChunkResult] = []
     lines = content.split("\n")
 
-    matches = list(header_pattern.finditer(content))
-    if not matches:
-        return _chunk_window(content, config)
-
-    # Find line numbers for each match
+    # Find header lines in one pass; the "#" prefix check skips the regex for body text
+    match_header = _HEADER_RE.match
     positions: list[tuple[int, str]] = []
-    for match in matches:
-        line_num = content[: match.start()].count("\n") + 1
-        positions.append((line_num, match.group(0)))
+    for line_num, line in enumerate(lines, 1):
+        if line[:1] == "#" and (match := match_header(line)):
+            positions.append((line_num, match.group(0)))
+
+    if not positions:
+        return _chunk_window(content, config)
 
     for i, (line_num, header) in enumerate(positions):
         end_line = positions[i + 1][0] - 1 if i + 1 < len(positions) else len(lines)
@@ -212,6 +240,8 @@ def _chunk_markdown(content: str, config: MembootConfig) -> list[ChunkResult]:
 
 def _chunk_yaml(content: str, config: MembootConfig) -> list[ChunkResult]:
     """Split YAML on top-level keys."""
+    import yaml
+
     try:
         data = yaml.safe_load(content)
     except yaml.YAMLError:
@@ -225,8 +255,9 @@ def _chunk_yaml(content: str, config: MembootConfig) -> list[ChunkResult]:
 
     # Find top-level key positions (lines starting with non-whitespace + colon)
     key_positions: list[tuple[int, str]] = []
+    match_key = _YAML_KEY_RE.match
     for i, line in enumerate(lines, 1):
-        match = re.match(r"^(\S+)\s*:", line)
+        match = match_key(line)
         if match:
             key_positions.append((i, match.group(1)))
 
@@ -250,17 +281,16 @@ def _chunk_yaml(content: str, config: MembootConfig) -> list[ChunkResult]:
 
 def _chunk_json(content: str, config: MembootConfig) -> list[ChunkResult]:
     """Split JSON on top-level keys."""
-    import json as json_mod
-
     try:
-        data = json_mod.loads(content)
-    except (json_mod.JSONDecodeError, ValueError):
+        data = json.loads(content)
+    except (json.JSONDecodeError, ValueError):
         return _chunk_window(content, config)
 
     if isinstance(data, dict):
         chunks: list[ChunkResult] = []
+        encode = _JSON_ENCODER.encode
         for key, value in data.items():
-            serialized = json_mod.dumps({key: value}, indent=2)
+            serialized = encode({key: value})
             chunks.append(
                 ChunkResult(
                     content=serialized,
@@ -277,10 +307,6 @@ def _chunk_json(content: str, config: MembootConfig) -> list[ChunkResult]:
 
 def _chunk_window(content: str, config: MembootConfig) -> list[ChunkResult]:
     """Sliding window chunking for arbitrary text."""
-    lines = content.split("\n")
-    if not lines:
-        return []
-
     # Estimate chars per chunk (~4 chars per token)
     chars_per_chunk = config.max_chunk_tokens * 4
     overlap_chars = config.overlap_tokens * 4
@@ -288,22 +314,19 @@ def _chunk_window(content: str, config: MembootConfig) -> list[ChunkResult]:
     chunks: list[ChunkResult] = []
     current_start = 0
     total_chars = len(content)
+    newlines = _newline_offsets(content)
 
     while current_start < total_chars:
         end = min(current_start + chars_per_chunk, total_chars)
-        chunk_text = content[current_start:end]
-
-        # Find line numbers
-        start_line = content[:current_start].count("\n") + 1
-        end_line = content[:end].count("\n") + 1
+        chunk_text = content[current_start:end].strip()
 
-        if chunk_text.strip():
+        if chunk_text:
             chunks.append(
                 ChunkResult(
-                    content=chunk_text.strip(),
+                    content=chunk_text,
                     chunk_type=ChunkType.WINDOW,
-                    start_line=start_line,
-                    end_line=end_line,
+                    start_line=_line_at(newlines, current_start),
+                    end_line=_line_at(newlines, end),
                 )
             )
 
@@ -312,3 +335,53 @@ def _chunk_window(content: str, config: MembootConfig) -> list[ChunkResult]:
         current_start = end - overlap_chars
 
     return chunks
+
+
+def _chunk_window_stream(pieces: Iterable[str], config: MembootConfig) -> Iterator[ChunkResult]:
+    """Sliding window chunking over text that arrives in pieces.
+
+    Yields the same chunks as ``_chunk_window("".join(pieces), config)`` while
+    holding only about one window of text at a time.
+    """
+    chars_per_chunk = config.max_chunk_tokens * 4
+    overlap_chars = config.overlap_tokens * 4
+
+    pieces_iter = iter(pieces)
+    exhausted = False
+    buf = ""  # text from absolute offset buf_start onwards
+    buf_start = 0
+    lines_before = 0  # newlines before buf_start
+    current_start = 0
+
+    while True:
+        rel_start = current_start - buf_start
+        # Read ahead past the window end so we know whether this is the last window
+        while not exhausted and len(buf) - rel_start <= chars_per_chunk:
+            piece = next(pieces_iter, None)
+            if piece is None:
+                exhausted = True
+            else:
+                buf += piece
+        if rel_start >= len(buf):
+            return
+
+        rel_end = min(rel_start + chars_per_chunk, len(buf))
+        chunk_text = buf[rel_start:rel_end].strip()
+        if chunk_text:
+            yield ChunkResult(
+                content=chunk_text,
+                chunk_type=ChunkType.WINDOW,
+                start_line=lines_before + buf.count("\n", 0, rel_start) + 1,
+                end_line=lines_before + buf.count("\n", 0, rel_end) + 1,
+            )
+
+        if rel_end >= len(buf):
+            return
+        current_start = buf_start + rel_end - overlap_chars
+
+        # Drop text before the next window, keeping the running line count
+        consumed = current_start - buf_start
+        if consumed > 0:
+            lines_before += buf.count("\n", 0, consumed)
+            buf = buf[consumed:]
+            buf_start = current_start
@@ -4,26 +4,33 @@ from __future__ import annotations
 
 import json as json_mod
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
 from memboot import __version__
 from memboot.exceptions import MembootError
-from memboot.licensing import (
-    TIER_DEFINITIONS,
-    get_license_info,
-    get_upgrade_message,
-    has_feature,
-)
 from memboot.telemetry import track_command, track_pro_gate
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
 app = typer.Typer(
     name="memboot",
     help="Zero-infrastructure persistent memory for any LLM.",
 )
-console = Console()
+
+_console: Console | None = None
+
+
+def _get_console() -> Console:
+    """Create the shared rich console on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
 
 
 @app.callback(invoke_without_command=True)
@@ -39,17 +46,20 @@ def main(
 ) -> None:
     """Zero-infrastructure persistent memory for any LLM."""
     if version:
-        console.print(f"memboot {__version__}")
+        typer.echo(f"memboot {__version__}")
         raise typer.Exit()
     if ctx.invoked_subcommand is None:
-        console.print(ctx.get_help())
+        _get_console().print(ctx.get_help())
         raise typer.Exit()
 
 
 @app.command()
 def status() -> None:
     """Show license status and available features."""
+    console = _get_console()
     track_command("status")
+    from memboot.licensing import TIER_DEFINITIONS, get_license_info
+
     info = get_license_info()
     tier_config = TIER_DEFINITIONS[info.tier]
 
@@ -73,6 +83,7 @@ def init_cmd(
     backend: str = typer.Option("tfidf", "--backend", "-b", help="Embedding backend."),
 ) -> None:
     """Scan, chunk, embed, and index a project."""
+    console = _get_console()
     track_command("init")
     from memboot.indexer import index_project
     from memboot.models import MembootConfig
@@ -120,7 +131,10 @@ def query(
     json: bool = typer.Option(False, "--json", help="Output as JSON."),
 ) -> None:
     """Search project memory."""
+    console = _get_console()
     track_command("query")
+    from rich.table import Table
+
     from memboot.query import search
 
     try:
@@ -163,6 +177,7 @@ def remember(
     tags: list[str] | None = typer.Option(None, "--tag", help="Tags (repeatable)."),
 ) -> None:
     """Store an episodic memory."""
+    console = _get_console()
     track_command("remember")
     from memboot.memory import remember as remember_fn
     from memboot.models import MemoryType
@@ -191,6 +206,7 @@ def context(
     top_k: int = typer.Option(10, "--top-k", "-k", help="Max results to consider."),
 ) -> None:
     """Export formatted context block."""
+    console = _get_console()
     track_command("context")
     from memboot.context import build_context
 
@@ -208,6 +224,7 @@ def reset(
     yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation."),
 ) -> None:
     """Clear all indexed data and memories."""
+    console = _get_console()
     track_command("reset")
     from memboot.indexer import get_db_path
 
@@ -235,7 +252,10 @@ def ingest(
     project_dir: Path = typer.Option(".", "--project", "-p", help="Project directory."),
 ) -> None:
     """Ingest an external file into project memory."""
+    console = _get_console()
     track_command("ingest")
+    from memboot.licensing import get_upgrade_message, has_feature
+
     if source.startswith(("http://", "https://")):
         if not has_feature("ingest_web"):
             track_pro_gate("ingest_web")
@@ -280,6 +300,7 @@ def watch(
     backend: str = typer.Option("tfidf", "--backend", "-b", help="Embedding backend."),
 ) -> None:
     """Watch project directory and auto-reindex on changes."""
+    console = _get_console()
     track_command("watch")
     from memboot.models import MembootConfig
 
@@ -315,7 +336,10 @@ def serve(
     project_dir: Path = typer.Option(".", "--project", "-p", help="Project directory."),
 ) -> None:
     """Start MCP stdio server (Pro feature)."""
+    console = _get_console()
     track_command("serve")
+    from memboot.licensing import get_upgrade_message, has_feature
+
     if not has_feature("serve"):
         track_pro_gate("serve")
         console.print(f"[yellow]{get_upgrade_message('serve')}[/yellow]")
@@ -337,6 +361,9 @@ def stats(
     json_output: bool = typer.Option(False, "--json", help="Output as JSON."),
 ) -> None:
     """Show local usage telemetry (requires MEMBOOT_TELEMETRY=1)."""
+    console = _get_console()
+    from rich.table import Table
+
     from memboot.telemetry import TelemetryStore, _telemetry_dir, is_enabled
 
     track_command("stats")
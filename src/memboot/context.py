@@ -2,9 +2,32 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
 
+from memboot.models import SearchResult
 from memboot.query import search
+from memboot.store import MembootStore
+
+
+def _entry_tokens(result: SearchResult) -> int:
+    """Rough token cost of a formatted entry (~4 chars per token plus framing)."""
+    return len(result.content) // 4 + 20
+
+
+def _format_entry(result: SearchResult) -> str:
+    """Render a single search result as a markdown section."""
+    if result.source.startswith("memory:"):
+        return f"### Memory\n{result.content}\n*Score: {result.score:.3f}*"
+
+    loc = result.source
+    if result.start_line is not None:
+        loc += f":{result.start_line}"
+        if result.end_line is not None:
+            loc += f"-{result.end_line}"
+    chunk_label = result.chunk_type.value if result.chunk_type else "text"
+    return f"### {loc} ({chunk_label})\n```\n{result.content}\n```\n*Score: {result.score:.3f}*"
 
 
 def build_context(
@@ -12,34 +35,17 @@ def build_context(
     project_path: Path,
     max_tokens: int = 4000,
     top_k: int = 10,
+    store: MembootStore | None = None,
 ) -> str:
     """Build a formatted markdown context block with source attribution."""
-    results = search(query_text, project_path, top_k=top_k)
+    results = search(query_text, project_path, top_k=top_k, store=store)
 
     if not results:
         return "## No relevant context found.\n"
 
-    sections: list[str] = []
-    total_tokens = 0
-
-    for r in results:
-        entry_tokens = len(r.content) // 4 + 20
-        if total_tokens + entry_tokens > max_tokens:
-            break
-
-        if r.source.startswith("memory:"):
-            sections.append(f"### Memory\n{r.content}\n*Score: {r.score:.3f}*")
-        else:
-            loc = r.source
-            if r.start_line is not None:
-                loc += f":{r.start_line}"
-                if r.end_line is not None:
-                    loc += f"-{r.end_line}"
-            chunk_label = r.chunk_type.value if r.chunk_type else "text"
-            sections.append(
-                f"### {loc} ({chunk_label})\n```\n{r.content}\n```\n*Score: {r.score:.3f}*"
-            )
-        total_tokens += entry_tokens
+    # Costs are positive, so running totals are sorted and the budget cutoff is a bisect
+    cutoff = bisect_right(list(accumulate(map(_entry_tokens, results))), max_tokens)
+    sections = [_format_entry(r) for r in results[:cutoff]]
 
     header = f"## Relevant Context ({len(sections)} results)\n\n"
     return header + "\n\n---\n\n".join(sections) + "\n"
@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
+import heapq
+import json
 import re
+import struct
 from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+from typing import TYPE_CHECKING
 
 import numpy as np
 
 from memboot.exceptions import EmbedError
 
+if TYPE_CHECKING:
+    from memboot.store import MembootStore
+
+# Meta keys for the fitted TF-IDF state: compact binary, and the JSON form older
+# indexes were written with (still read as a fallback).
+TFIDF_STATE_KEY = "tfidf_state_bin"
+TFIDF_STATE_JSON_KEY = "tfidf_state"
+
+# Binary state layout: header, float32 IDF weights, then newline-joined UTF-8 terms
+# in index order. Tokens are \w runs, so they never contain a newline.
+_STATE_MAGIC = b"TFv1"
+_STATE_HEADER = struct.Struct("<4sII")  # magic, max_features, vocabulary size
+
 
 class BaseEmbedder(ABC):
     """Abstract embedding backend."""
@@ -27,9 +47,18 @@ class BaseEmbedder(ABC):
         return self.embed_texts([text])[0]
 
 
+# A greedy \w run is already delimited by non-word characters, so no \b anchors are
+# needed. Pure-ASCII text (the common case for code) takes a cheaper ASCII-only class.
+_TOKEN_RE = re.compile(r"\w{2,}")
+_ASCII_TOKEN_RE = re.compile(r"[a-z0-9_]{2,}")
+
+
 def _tokenize(text: str) -> list[str]:
     """Simple whitespace + punctuation tokenizer."""
-    return re.findall(r"\b\w{2,}\b", text.lower())
+    lowered = text.lower()
+    if lowered.isascii():
+        return _ASCII_TOKEN_RE.findall(lowered)
+    return _TOKEN_RE.findall(lowered)
 
 
 class TfidfEmbedder(BaseEmbedder):
@@ -49,17 +78,29 @@ class TfidfEmbedder(BaseEmbedder):
         """Build vocabulary and IDF weights from corpus."""
         if not texts:
             raise EmbedError("Cannot fit on empty corpus")
+        self._fit_tokens([_tokenize(text) for text in texts])
 
-        n_docs = len(texts)
-        doc_freq: dict[str, int] = {}
-        for text in texts:
-            tokens = set(_tokenize(text))
-            for token in tokens:
-                doc_freq[token] = doc_freq.get(token, 0) + 1
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        """Compute TF-IDF vectors, L2-normalized."""
+        return self._embed_tokens([_tokenize(text) for text in texts])
+
+    def fit_transform(self, texts: list[str]) -> np.ndarray:
+        """Fit on texts and embed them, tokenizing each text only once."""
+        if not texts:
+            raise EmbedError("Cannot fit on empty corpus")
+        tokenized = [_tokenize(text) for text in texts]
+        self._fit_tokens(tokenized)
+        return self._embed_tokens(tokenized)
+
+    def _fit_tokens(self, tokenized: list[list[str]]) -> None:
+        """Build vocabulary and IDF weights from pre-tokenized documents."""
+        n_docs = len(tokenized)
+        doc_freq: Counter[str] = Counter()
+        for tokens in tokenized:
+            doc_freq.update(set(tokens))
 
         # Select top features by document frequency
-        sorted_tokens = sorted(doc_freq.items(), key=lambda x: x[1], reverse=True)
-        top_tokens = sorted_tokens[: self._max_features]
+        top_tokens = heapq.nlargest(self._max_features, doc_freq.items(), key=itemgetter(1))
 
         self._vocabulary = {token: idx for idx, (token, _) in enumerate(top_tokens)}
 
@@ -72,40 +113,45 @@ class TfidfEmbedder(BaseEmbedder):
         self._idf = idf
         self._fitted = True
 
-    def embed_texts(self, texts: list[str]) -> np.ndarray:
-        """Compute TF-IDF vectors, L2-normalized."""
+    def _embed_tokens(self, tokenized: list[list[str]]) -> np.ndarray:
+        """Compute L2-normalized TF-IDF vectors for pre-tokenized documents."""
         if not self._fitted or self._idf is None:
             raise EmbedError("Embedder not fitted. Call fit() first.")
 
-        n_texts = len(texts)
-        dim = len(self._vocabulary)
-        matrix = np.zeros((n_texts, dim), dtype=np.float32)
-
-        for i, text in enumerate(texts):
-            tokens = _tokenize(text)
-            if not tokens:
-                continue
-            token_count: dict[str, int] = {}
-            for token in tokens:
-                token_count[token] = token_count.get(token, 0) + 1
-
-            total = len(tokens)
-            for token, count in token_count.items():
-                if token in self._vocabulary:
-                    idx = self._vocabulary[token]
-                    tf = count / total
-                    matrix[i, idx] = tf * self._idf[idx]
+        n_texts = len(tokenized)
+        vocabulary = self._vocabulary
+        dim = len(vocabulary)
+
+        # Collect (row, col) coordinates of in-vocabulary tokens in one pass, then
+        # count them with one np.unique instead of per-token stores.
+        rows: list[int] = []
+        cols: list[int] = []
+        totals = np.zeros(n_texts, dtype=np.float32)
+        lookup = vocabulary.get
+        for i, tokens in enumerate(tokenized):
+            totals[i] = len(tokens)
+            ids = [idx for idx in map(lookup, tokens) if idx is not None]
+            cols.extend(ids)
+            rows.extend([i] * len(ids))
+
+        # Allocate at output width up front so no pad-and-copy is needed afterwards.
+        # Counts go straight into the float32 output: the temporaries scale with the
+        # number of tokens, not with a dense n_texts x width integer matrix.
+        width = max(dim, self._max_features)
+        matrix = np.zeros((n_texts, width), dtype=np.float32)
+        flat = np.asarray(rows, dtype=np.intp) * width + np.asarray(cols, dtype=np.intp)
+        positions, counts = np.unique(flat, return_counts=True)
+        matrix.ravel()[positions] = counts
+
+        # TF = count / total tokens, weighted by IDF
+        totals[totals == 0] = 1.0
+        matrix /= totals[:, None]
+        matrix[:, :dim] *= self._idf
 
         # L2 normalize rows
-        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
-        norms = np.where(norms == 0, 1.0, norms)
-        matrix = matrix / norms
-
-        # Pad or truncate to max_features
-        if dim < self._max_features:
-            padded = np.zeros((n_texts, self._max_features), dtype=np.float32)
-            padded[:, :dim] = matrix
-            matrix = padded
+        norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+        norms[norms == 0] = 1.0
+        matrix /= norms[:, None]
 
         return matrix
 
@@ -128,6 +174,82 @@ class TfidfEmbedder(BaseEmbedder):
         embedder._fitted = True
         return embedder
 
+    def save_state_bytes(self) -> bytes:
+        """Serialize vocabulary and IDF to the compact binary state format."""
+        if not self._fitted or self._idf is None:
+            raise EmbedError("Cannot save state: not fitted")
+        terms = sorted(self._vocabulary, key=self._vocabulary.__getitem__)
+        return b"".join(
+            (
+                _STATE_HEADER.pack(_STATE_MAGIC, self._max_features, len(terms)),
+                self._idf.astype("<f4").tobytes(),
+                "\n".join(terms).encode(),
+            )
+        )
+
+    @classmethod
+    def from_state_bytes(cls, data: bytes) -> TfidfEmbedder:
+        """Restore embedder from state written by save_state_bytes()."""
+        try:
+            magic, max_features, n_terms = _STATE_HEADER.unpack_from(data)
+        except struct.error as exc:
+            raise EmbedError(f"Corrupt TF-IDF state: {exc}") from exc
+        if magic != _STATE_MAGIC:
+            raise EmbedError("Corrupt TF-IDF state: bad header")
+        idf_end = _STATE_HEADER.size + 4 * n_terms
+        if len(data) < idf_end:
+            raise EmbedError("Corrupt TF-IDF state: truncated IDF")
+        try:
+            terms = data[idf_end:].decode().split("\n") if n_terms else []
+        except UnicodeDecodeError as exc:
+            raise EmbedError(f"Corrupt TF-IDF state: {exc}") from exc
+        if len(terms) != n_terms:
+            raise EmbedError("Corrupt TF-IDF state: vocabulary size mismatch")
+
+        embedder = cls(max_features=max_features)
+        embedder._vocabulary = dict(zip(terms, range(n_terms), strict=True))
+        embedder._idf = np.frombuffer(data, dtype="<f4", count=n_terms, offset=_STATE_HEADER.size)
+        embedder._fitted = True
+        return embedder
+
+
+@lru_cache(maxsize=8)
+def restore_tfidf_embedder(state: str | bytes) -> TfidfEmbedder:
+    """Restore a TfidfEmbedder from binary state, or from the legacy JSON text.
+
+    Memoized on the state itself, so repeated calls against an unchanged index
+    skip decoding and the vocabulary rebuild. The instance is shared; do not refit it.
+    """
+    if isinstance(state, bytes):
+        return TfidfEmbedder.from_state_bytes(state)
+    return TfidfEmbedder.from_state(json.loads(state))
+
+
+def load_tfidf_embedder(store: MembootStore) -> TfidfEmbedder | None:
+    """Restore the fitted TfidfEmbedder saved in a store, or None if there is none."""
+    state: str | bytes | None = store.get_meta_blob(TFIDF_STATE_KEY) or store.get_meta(
+        TFIDF_STATE_JSON_KEY
+    )
+    return restore_tfidf_embedder(state) if state else None
+
+
+def load_embedder(store: MembootStore) -> BaseEmbedder | None:
+    """Restore the embedder a store was indexed with.
+
+    Returns None when the backend is TF-IDF but no fitted state has been saved.
+    Instances are shared between calls; do not refit them.
+    """
+    backend = store.get_meta("embedding_backend") or "tfidf"
+    if backend == "tfidf":
+        return load_tfidf_embedder(store)
+    return _shared_embedder(backend)
+
+
+@lru_cache(maxsize=4)
+def _shared_embedder(backend: str) -> BaseEmbedder:
+    """One embedder per stateless backend, so model weights load once per process."""
+    return get_embedder(backend)
+
 
 class SentenceTransformerEmbedder(BaseEmbedder):
     """High-quality embeddings via sentence-transformers (optional)."""
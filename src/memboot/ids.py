@@ -0,0 +1,11 @@
+"""Identifier generation shared by the indexer and the ingesters."""
+
+from __future__ import annotations
+
+import os
+
+
+def new_ids(n: int) -> list[str]:
+    """Generate n random 128-bit hex identifiers from a single urandom call."""
+    pool = os.urandom(16 * n).hex()
+    return [pool[i : i + 32] for i in range(0, 32 * n, 32)]
@@ -3,62 +3,147 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import UTC, datetime
-from fnmatch import fnmatch
+from fnmatch import translate
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from uuid import uuid4
 
-from memboot.chunker import chunk_file
-from memboot.embedder import TfidfEmbedder, get_embedder
+from memboot.chunker import ChunkResult, chunk_file
+from memboot.embedder import (
+    TFIDF_STATE_JSON_KEY,
+    TFIDF_STATE_KEY,
+    TfidfEmbedder,
+    get_embedder,
+    load_tfidf_embedder,
+)
 from memboot.exceptions import IndexingError
+from memboot.ids import new_ids
 from memboot.models import Chunk, MembootConfig, ProjectInfo
 from memboot.store import MembootStore
 
 
 def compute_project_hash(project_path: Path) -> str:
     """Hash a project path to a short identifier."""
-    return hashlib.sha256(str(project_path.resolve()).encode()).hexdigest()[:12]
+    return _hash_resolved_path(str(project_path.resolve()))
+
+
+@lru_cache(maxsize=64)
+def _hash_resolved_path(resolved: str) -> str:
+    """Short SHA-256 digest of a resolved project path, memoized per process."""
+    return hashlib.sha256(resolved.encode()).hexdigest()[:12]
 
 
 def get_db_path(project_path: Path) -> Path:
-    """Derive the SQLite database path for a project."""
-    memboot_home = Path("~/.memboot").expanduser()
-    memboot_home.mkdir(parents=True, exist_ok=True)
-    return memboot_home / f"{compute_project_hash(project_path)}.db"
+    """Derive the SQLite database path for a project.
+
+    Databases live under $MEMBOOT_HOME, or ~/.memboot when it is unset.
+    """
+    memboot_home = os.path.expanduser(os.environ.get("MEMBOOT_HOME") or "~/.memboot")
+    if not project_path.is_absolute():
+        project_path = project_path.resolve()
+    return _db_path(memboot_home, str(project_path))
+
+
+@lru_cache(maxsize=64)
+def _db_path(memboot_home: str, project_path: str) -> Path:
+    """Database path for an absolute project path, memoized per process.
+
+    The home directory is created on first use. Memoizing also skips
+    re-resolving the project path, which costs an lstat per component.
+    """
+    home = Path(memboot_home)
+    home.mkdir(parents=True, exist_ok=True)
+    return home / f"{compute_project_hash(Path(project_path))}.db"
+
+
+@lru_cache(maxsize=32)
+def _compile_ignores(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile glob ignore patterns into a single alternation regex."""
+    if not patterns:
+        return re.compile(r"(?!)")  # never matches
+    return re.compile("|".join(translate(pattern) for pattern in patterns))
 
 
 def _should_ignore(path: Path, ignore_patterns: list[str]) -> bool:
     """Check if a path matches any ignore pattern."""
-    for pattern in ignore_patterns:
-        if fnmatch(path.name, pattern):
-            return True
-        for parent in path.parents:
-            if fnmatch(parent.name, pattern):
-                return True
-    return False
+    match = _compile_ignores(tuple(ignore_patterns)).match
+    return bool(match(path.name)) or any(match(parent.name) for parent in path.parents)
 
 
 def discover_files(project_path: Path, config: MembootConfig) -> list[Path]:
     """Walk project directory and collect indexable files."""
+    is_ignored = _compile_ignores(tuple(config.ignore_patterns)).match
+    extensions = frozenset(config.file_extensions)
     files: list[Path] = []
-    for path in sorted(project_path.rglob("*")):
-        if not path.is_file():
+
+    # Depth-first scandir walk. Ignored directories are pruned before they are
+    # opened, so only basenames need matching. Entries are visited in name order,
+    # which yields the same ordering as sorting the full path list.
+    stack: list[os.DirEntry[str]] = []
+
+    def push_children(directory: str) -> None:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+        stack.extend(reversed(entries))
+
+    push_children(str(project_path))
+    while stack:
+        entry = stack.pop()
+        name = entry.name
+        if is_ignored(name):
             continue
-        if _should_ignore(path.relative_to(project_path), config.ignore_patterns):
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                push_children(entry.path)
+                continue
+            if not entry.is_file():
+                continue
+        except OSError:
             continue
-        if path.suffix.lower() in config.file_extensions:
-            files.append(path)
+        # Suffix from the last dot, like splitext; a leading dot (".md") is a name, not one
+        dot = name.rfind(".")
+        if dot > 0 and name[dot:].lower() in extensions:
+            files.append(Path(entry.path))
     return files
 
 
+# Below this many files, worker start-up costs more than chunking serially
+_PARALLEL_CHUNK_MIN_FILES = 64
+
+
+def _chunk_files(files: list[Path], config: MembootConfig) -> list[list[ChunkResult]]:
+    """Chunk files in order, fanning out to worker processes for large batches."""
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(files) < _PARALLEL_CHUNK_MIN_FILES:
+        return [chunk_file(file_path, config) for file_path in files]
+    # Never fork: index_project also runs on the watcher's worker thread, and a
+    # child forked while other threads hold locks can deadlock on them
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return list(executor.map(chunk_file, files, repeat(config), chunksize=16))
+
+
 def _categorize_files(
     files: list[Path],
     project_path: Path,
     stored_meta: dict[str, tuple[float, int, int]],
+    rel_paths: dict[Path, str] | None = None,
+    stats: dict[Path, os.stat_result] | None = None,
 ) -> tuple[list[Path], list[Path], list[Path], list[str]]:
     """Categorize discovered files against stored metadata.
 
+    Relative paths and stat results already computed by the caller can be
+    passed in to avoid recomputing them.
+
     Returns (unchanged, changed, new, deleted_rel_paths).
     """
     unchanged: list[Path] = []
@@ -67,23 +152,46 @@ def _categorize_files(
     seen: set[str] = set()
 
     for file_path in files:
-        rel = str(file_path.relative_to(project_path))
+        rel = rel_paths[file_path] if rel_paths else str(file_path.relative_to(project_path))
         seen.add(rel)
-        stat = file_path.stat()
+        stat = stats[file_path] if stats else file_path.stat()
 
-        if rel in stored_meta:
-            stored_mtime, stored_size, _ = stored_meta[rel]
-            if stat.st_mtime == stored_mtime and stat.st_size == stored_size:
-                unchanged.append(file_path)
-            else:
-                changed.append(file_path)
-        else:
+        stored = stored_meta.get(rel)
+        if stored is None:
             new.append(file_path)
+        elif stored[:2] == (stat.st_mtime, stat.st_size):
+            unchanged.append(file_path)
+        else:
+            changed.append(file_path)
 
     deleted = [p for p in stored_meta if p not in seen]
     return unchanged, changed, new, deleted
 
 
+def _content_hash(file_path: Path) -> str | None:
+    """BLAKE2b digest of a file's bytes, or None if it cannot be read."""
+    try:
+        return hashlib.blake2b(file_path.read_bytes(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+
+
+# Below this many files, thread start-up costs more than hashing serially
+_PARALLEL_HASH_MIN_FILES = 64
+
+
+def _content_hashes(files: list[Path]) -> list[str | None]:
+    """Hash files in order, overlapping their reads on a thread pool for large batches.
+
+    File reads and BLAKE2b over buffers this size release the GIL.
+    """
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(files) < _PARALLEL_HASH_MIN_FILES:
+        return [_content_hash(file_path) for file_path in files]
+    with ThreadPoolExecutor(max_workers=min(32, workers * 4)) as executor:
+        return list(executor.map(_content_hash, files))
+
+
 def index_project(
     project_path: Path,
     config: MembootConfig | None = None,
@@ -100,6 +208,7 @@ def index_project(
     if not project_path.is_dir():
         raise IndexingError(f"Not a directory: {project_path}")
 
+    project_hash = compute_project_hash(project_path)
     db_path = get_db_path(project_path)
     store = MembootStore(db_path)
 
@@ -112,17 +221,27 @@ def index_project(
         store.close()
         return ProjectInfo(
             project_path=str(project_path),
-            project_hash=compute_project_hash(project_path),
+            project_hash=project_hash,
             db_path=str(db_path),
         )
 
+    # Relative path and stat for each file, computed once and reused below
+    # discover_files builds every path under project_path, so slicing off the
+    # prefix is equivalent to relative_to without re-parsing each path
+    prefix_len = len(os.path.join(str(project_path), ""))
+    rel_paths = {file_path: str(file_path)[prefix_len:] for file_path in files}
+    stats = {file_path: file_path.stat() for file_path in files}
+
     # Categorize files against stored metadata
     stored_meta = store.get_all_file_meta()
+    hashes: dict[Path, str | None] = {}
 
     if force or not stored_meta:
         # First run or forced: treat everything as new
         files_to_process = files
         deleted_files: list[str] = []
+        changed_rels: list[str] = []
+        touched_meta: list[tuple[str, float, int, int, str | None]] = []
         unchanged_count = 0
         changed_count = 0
         new_count = len(files)
@@ -131,25 +250,43 @@ def index_project(
             files,
             project_path,
             stored_meta,
+            rel_paths,
+            stats,
         )
+
+        # A changed mtime/size with identical bytes (e.g. touch) only needs its
+        # metadata refreshed, not re-chunking and re-embedding
+        stored_hashes = store.get_file_hashes()
+        touched_meta = []
+        still_changed: list[Path] = []
+        hashes.update(zip(changed, _content_hashes(changed), strict=True))
+        for file_path in changed:
+            rel = rel_paths[file_path]
+            digest = hashes[file_path]
+            if digest is not None and digest == stored_hashes.get(rel):
+                stat = stats[file_path]
+                touched_meta.append((rel, stat.st_mtime, stat.st_size, stored_meta[rel][2], digest))
+                unchanged.append(file_path)
+            else:
+                still_changed.append(file_path)
+        changed = still_changed
+
         files_to_process = changed + new_files
         unchanged_count = len(unchanged)
         changed_count = len(changed)
         new_count = len(new_files)
 
-        # Remove chunks for changed + deleted files
-        for rel_path in deleted_files:
-            store.delete_chunks_by_file(rel_path)
-            store.delete_file_meta(rel_path)
-        for file_path in changed:
-            rel = str(file_path.relative_to(project_path))
-            store.delete_chunks_by_file(rel)
+        changed_rels = [rel_paths[p] for p in changed]
 
     # Nothing to process — everything unchanged
     if not files_to_process:
+        with store.transaction():
+            store.delete_chunks_by_files(deleted_files)
+            store.delete_file_metas(deleted_files)
+            store.set_file_meta_many(touched_meta)
         info = ProjectInfo(
             project_path=str(project_path),
-            project_hash=compute_project_hash(project_path),
+            project_hash=project_hash,
             db_path=str(db_path),
             chunk_count=store.count_chunks(),
             memory_count=store.count_memories(),
@@ -167,21 +304,29 @@ def index_project(
         store.close()
         return info
 
-    # Chunk only files that need processing
+    # Hash before reading for chunks: if a file changes in between, the stored hash
+    # is of the older bytes and the next run re-indexes it
+    unhashed = [file_path for file_path in files_to_process if file_path not in hashes]
+    hashes.update(zip(unhashed, _content_hashes(unhashed), strict=True))
+
+    # Chunk only files that need processing; Chunk objects are built here, not in workers
     new_chunks: list[Chunk] = []
     file_chunk_counts: dict[str, int] = {}
-    for file_path in files_to_process:
-        rel = str(file_path.relative_to(project_path))
-        results = chunk_file(file_path, config)
+    chunked = _chunk_files(files_to_process, config)
+    chunk_ids = iter(new_ids(sum(map(len, chunked))))
+    created_at = datetime.now(UTC).isoformat()  # one timestamp for the whole batch
+    for file_path, results in zip(files_to_process, chunked, strict=True):
+        rel = rel_paths[file_path]
         count = 0
         for result in results:
             chunk = Chunk(
-                id=str(uuid4()),
+                id=next(chunk_ids),
                 content=result.content,
                 source_file=rel,
                 start_line=result.start_line,
                 end_line=result.end_line,
                 chunk_type=result.chunk_type,
+                created_at=created_at,
             )
             new_chunks.append(chunk)
             count += 1
@@ -189,43 +334,66 @@ def index_project(
 
     # Embed new chunks
     embedder = get_embedder(config.embedding_backend, max_features=config.max_features)
+    embeddings = None
+    tfidf_state: bytes | None = None
     if new_chunks:
+        texts = [c.content for c in new_chunks]
         if isinstance(embedder, TfidfEmbedder):
-            stored_state = store.get_meta("tfidf_state")
-            if force or not stored_state:
-                # First run or forced: fit on all content
-                embedder.fit([c.content for c in new_chunks])
-                store.set_meta("tfidf_state", json.dumps(embedder.save_state()))
+            restored = None if force else load_tfidf_embedder(store)
+            if restored is None:
+                # First run or forced: fit on all content, tokenizing it once
+                embeddings = embedder.fit_transform(texts)
+                tfidf_state = embedder.save_state_bytes()
             else:
                 # Incremental: restore vocabulary, new terms get zero weight
-                embedder = TfidfEmbedder.from_state(json.loads(stored_state))
-
-        embeddings = embedder.embed_texts([c.content for c in new_chunks])
-        for i, chunk in enumerate(new_chunks):
-            chunk.embedding = embeddings[i].tolist()
-
-    # Store new chunks
-    store.add_chunks(new_chunks)
-
-    # Update file metadata for all processed files
-    for file_path in files_to_process:
-        rel = str(file_path.relative_to(project_path))
-        stat = file_path.stat()
-        store.set_file_meta(rel, stat.st_mtime, stat.st_size, file_chunk_counts.get(rel, 0))
+                embedder = restored
+
+        if embeddings is None:
+            embeddings = embedder.embed_texts(texts)
+
+    # Apply all writes in one transaction: stale chunk removal, new chunks, metadata
+    with store.transaction():
+        store.delete_chunks_by_files(deleted_files + changed_rels)
+        store.delete_file_metas(deleted_files)
+
+        if tfidf_state is not None:
+            store.set_meta_blob(TFIDF_STATE_KEY, tfidf_state)
+            store.delete_meta(TFIDF_STATE_JSON_KEY)  # superseded legacy JSON state
+
+        # Store new chunks, serializing embeddings straight from the matrix
+        store.add_chunks(new_chunks, embeddings)
+
+        # Update file metadata for all processed files. The stat was taken before
+        # the file was read, so an edit made during indexing is picked up next run.
+        file_meta = touched_meta
+        for file_path in files_to_process:
+            rel = rel_paths[file_path]
+            stat = stats[file_path]
+            file_meta.append(
+                (
+                    rel,
+                    stat.st_mtime,
+                    stat.st_size,
+                    file_chunk_counts.get(rel, 0),
+                    hashes[file_path],
+                )
+            )
+        store.set_file_meta_many(file_meta)
 
-    # Update store metadata
-    store.set_meta("embedding_dim", str(embedder.dim))
-    store.set_meta("embedding_backend", config.embedding_backend)
-    store.set_meta("last_indexed", datetime.now(UTC).isoformat())
-    store.set_meta("project_path", str(project_path))
+        # Update store metadata
+        last_indexed = datetime.now(UTC).isoformat()
+        store.set_meta("embedding_dim", str(embedder.dim))
+        store.set_meta("embedding_backend", config.embedding_backend)
+        store.set_meta("last_indexed", last_indexed)
+        store.set_meta("project_path", str(project_path))
 
     info = ProjectInfo(
         project_path=str(project_path),
-        project_hash=compute_project_hash(project_path),
+        project_hash=project_hash,
         db_path=str(db_path),
         chunk_count=store.count_chunks(),
         memory_count=store.count_memories(),
-        last_indexed=datetime.now(UTC).isoformat(),
+        last_indexed=last_indexed,
         embedding_dim=embedder.dim,
         embedding_backend=config.embedding_backend,
         metadata={
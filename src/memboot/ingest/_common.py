@@ -0,0 +1,30 @@
+"""Shared embed-and-store step for the ingest paths."""
+
+from __future__ import annotations
+
+from memboot.embedder import TfidfEmbedder, load_embedder
+from memboot.models import Chunk
+from memboot.store import MembootStore
+
+
+def embed_and_store(store: MembootStore, chunks: list[Chunk]) -> list[Chunk]:
+    """Embed chunks with the project's embedder, store them, and return them.
+
+    Uses the index's embedder (shared per process) when there is one; otherwise
+    fits a fresh TF-IDF embedder on the chunks themselves. Returned chunks carry
+    their embedding vectors.
+    """
+    texts = [c.content for c in chunks]
+    embedder = load_embedder(store)
+    if embedder is not None:
+        embeddings = embedder.embed_texts(texts)
+    else:
+        # No index yet: fit on these chunks, tokenizing them only once
+        embeddings = TfidfEmbedder().fit_transform(texts)
+
+    store.add_chunks(chunks, embeddings)
+
+    # Returned chunks carry their vectors; convert the matrix in one call
+    for chunk, vector in zip(chunks, embeddings.tolist(), strict=True):
+        chunk.embedding = vector
+    return chunks
@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-import json
+from datetime import UTC, datetime
 from pathlib import Path
-from uuid import uuid4
 
 from memboot.chunker import chunk_file
-from memboot.embedder import TfidfEmbedder, get_embedder
 from memboot.exceptions import IngestError
+from memboot.ids import new_ids
 from memboot.indexer import get_db_path
+from memboot.ingest._common import embed_and_store
 from memboot.models import Chunk, MembootConfig
 from memboot.store import MembootStore
 
@@ -39,35 +39,20 @@ def ingest_file(
         if not results:
             return []
 
+        created_at = datetime.now(UTC).isoformat()
         chunks: list[Chunk] = []
-        for result in results:
+        for result, chunk_id in zip(results, new_ids(len(results)), strict=True):
             chunk = Chunk(
-                id=str(uuid4()),
+                id=chunk_id,
                 content=result.content,
                 source_file=str(file_path),
                 start_line=result.start_line,
                 end_line=result.end_line,
                 chunk_type=result.chunk_type,
+                created_at=created_at,
             )
             chunks.append(chunk)
 
-        # Embed
-        backend = store.get_meta("embedding_backend") or "tfidf"
-        if backend == "tfidf":
-            state_json = store.get_meta("tfidf_state")
-            if state_json:
-                embedder = TfidfEmbedder.from_state(json.loads(state_json))
-            else:
-                embedder = TfidfEmbedder()
-                embedder.fit([c.content for c in chunks])
-        else:
-            embedder = get_embedder(backend)
-
-        embeddings = embedder.embed_texts([c.content for c in chunks])
-        for i, chunk in enumerate(chunks):
-            chunk.embedding = embeddings[i].tolist()
-
-        store.add_chunks(chunks)
-        return chunks
+        return embed_and_store(store, chunks)
     finally:
         store.close()
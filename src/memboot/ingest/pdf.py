@@ -2,18 +2,36 @@
 
 from __future__ import annotations
 
-import json
+from collections.abc import Iterator
+from datetime import UTC, datetime
 from pathlib import Path
-from uuid import uuid4
+from typing import Any
 
-from memboot.chunker import _chunk_window
-from memboot.embedder import TfidfEmbedder, get_embedder
+from memboot.chunker import _chunk_window_stream
 from memboot.exceptions import IngestError
+from memboot.ids import new_ids
 from memboot.indexer import get_db_path
+from memboot.ingest._common import embed_and_store
 from memboot.models import Chunk, ChunkType, MembootConfig
 from memboot.store import MembootStore
 
 
+def _page_texts(pdf: Any) -> Iterator[str]:
+    """Yield non-empty page texts of an open PDF, separated by blank lines."""
+    separator = ""
+    for page in pdf.pages:
+        # Bag-of-words embedding has no use for layout fidelity; the simple extractor
+        # groups characters into lines without extract_text()'s word clustering.
+        text = page.extract_text_simple(x_tolerance=3, y_tolerance=3)
+        # Drop the page's parsed layout objects before moving on, so peak
+        # memory tracks one page rather than the whole document.
+        page.flush_cache()
+        if text and text.strip():
+            yield separator
+            yield text
+            separator = "\n\n"
+
+
 def ingest_pdf(
     file_path: Path,
     project_path: Path,
@@ -36,36 +54,27 @@ def ingest_pdf(
     if not file_path.is_file():
         raise IngestError(f"File not found: {file_path}")
 
-    # Extract text from PDF
-    pages_text: list[str] = []
+    # Extract and chunk page by page, without building the full document text
     try:
         with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text and text.strip():
-                    pages_text.append(text)
+            chunk_results = list(_chunk_window_stream(_page_texts(pdf), config))
     except Exception as exc:
         raise IngestError(f"Failed to read PDF {file_path}: {exc}") from exc
 
-    if not pages_text:
-        return []
-
-    # Chunk the combined text
-    full_text = "\n\n".join(pages_text)
-    chunk_results = _chunk_window(full_text, config)
-
     if not chunk_results:
         return []
 
+    created_at = datetime.now(UTC).isoformat()
     chunks: list[Chunk] = []
-    for result in chunk_results:
+    for result, chunk_id in zip(chunk_results, new_ids(len(chunk_results)), strict=True):
         chunk = Chunk(
-            id=str(uuid4()),
+            id=chunk_id,
             content=result.content,
             source_file=str(file_path),
             start_line=result.start_line,
             end_line=result.end_line,
             chunk_type=ChunkType.WINDOW,
+            created_at=created_at,
         )
         chunks.append(chunk)
 
@@ -74,22 +83,6 @@ def ingest_pdf(
     store = MembootStore(db_path)
 
     try:
-        backend = store.get_meta("embedding_backend") or "tfidf"
-        if backend == "tfidf":
-            state_json = store.get_meta("tfidf_state")
-            if state_json:
-                embedder = TfidfEmbedder.from_state(json.loads(state_json))
-            else:
-                embedder = TfidfEmbedder()
-                embedder.fit([c.content for c in chunks])
-        else:
-            embedder = get_embedder(backend)
-
-        embeddings = embedder.embed_texts([c.content for c in chunks])
-        for i, chunk in enumerate(chunks):
-            chunk.embedding = embeddings[i].tolist()
-
-        store.add_chunks(chunks)
-        return chunks
+        return embed_and_store(store, chunks)
     finally:
         store.close()
@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-import json
+from datetime import UTC, datetime
 from pathlib import Path
-from uuid import uuid4
 
 from memboot.chunker import _chunk_window
-from memboot.embedder import TfidfEmbedder, get_embedder
 from memboot.exceptions import IngestError
+from memboot.ids import new_ids
 from memboot.indexer import get_db_path
+from memboot.ingest._common import embed_and_store
 from memboot.models import Chunk, ChunkType, MembootConfig
 from memboot.store import MembootStore
 
@@ -52,15 +52,17 @@ def ingest_url(
     if not chunk_results:
         return []
 
+    created_at = datetime.now(UTC).isoformat()
     chunks: list[Chunk] = []
-    for result in chunk_results:
+    for result, chunk_id in zip(chunk_results, new_ids(len(chunk_results)), strict=True):
         chunk = Chunk(
-            id=str(uuid4()),
+            id=chunk_id,
             content=result.content,
             source_file=url,
             start_line=result.start_line,
             end_line=result.end_line,
             chunk_type=ChunkType.WINDOW,
+            created_at=created_at,
         )
         chunks.append(chunk)
 
@@ -69,22 +71,6 @@ def ingest_url(
     store = MembootStore(db_path)
 
     try:
-        backend = store.get_meta("embedding_backend") or "tfidf"
-        if backend == "tfidf":
-            state_json = store.get_meta("tfidf_state")
-            if state_json:
-                embedder = TfidfEmbedder.from_state(json.loads(state_json))
-            else:
-                embedder = TfidfEmbedder()
-                embedder.fit([c.content for c in chunks])
-        else:
-            embedder = get_embedder(backend)
-
-        embeddings = embedder.embed_texts([c.content for c in chunks])
-        for i, chunk in enumerate(chunks):
-            chunk.embedding = embeddings[i].tolist()
-
-        store.add_chunks(chunks)
-        return chunks
+        return embed_and_store(store, chunks)
     finally:
         store.close()
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import hashlib
+import hmac
 import logging
 import os
+import re
 from enum import StrEnum
-from pathlib import Path
+from functools import lru_cache
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -24,6 +26,11 @@ _LICENSE_LOCATIONS: list[str] = [
 
 _ENV_LICENSE_KEY = "MEMBOOT_LICENSE"
 
+# Segments are uppercase ASCII letters and digits; check segments are hex
+# digests, so an all-digit segment is valid
+_KEY_FORMAT = re.compile(r"MMBT-([A-Z0-9]{4}-[A-Z0-9]{4})-([A-Z0-9]{4})")
+_LICENSE_READ_LIMIT = 4096
+
 
 class Tier(StrEnum):
     """Product tier levels."""
@@ -85,6 +92,12 @@ PRO_FEATURES: frozenset[str] = frozenset(
 )
 
 
+# Feature sets per tier, for O(1) membership checks in has_feature()
+_TIER_FEATURES: dict[Tier, frozenset[str]] = {
+    tier: frozenset(config.features) for tier, config in TIER_DEFINITIONS.items()
+}
+
+
 class LicenseInfo(BaseModel):
     """Validated license information."""
 
@@ -94,18 +107,15 @@ class LicenseInfo(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
+def _parse_key(key: str) -> tuple[str, str] | None:
+    """Split a ``MMBT-XXXX-XXXX-XXXX`` key into (body, check segment), or None."""
+    match = _KEY_FORMAT.fullmatch(key.strip())
+    return (match[1], match[2]) if match else None
+
+
 def _validate_key_format(key: str) -> bool:
     """Check if a license key matches ``MMBT-XXXX-XXXX-XXXX``."""
-    key = key.strip()
-    if not key.startswith("MMBT-"):
-        return False
-    parts = key.split("-")
-    if len(parts) != 4:
-        return False
-    for part in parts[1:]:
-        if len(part) != 4 or not part.isalnum() or not part.isupper():
-            return False
-    return True
+    return _parse_key(key) is not None
 
 
 def _compute_check_segment(body: str) -> str:
@@ -119,9 +129,12 @@ def _validate_key_checksum(key: str) -> bool:
     parts = key.strip().split("-")
     if len(parts) != 4:
         return False
-    body = f"{parts[1]}-{parts[2]}"
-    expected = _compute_check_segment(body)
-    return parts[3] == expected
+    return _checksum_matches(f"{parts[1]}-{parts[2]}", parts[3])
+
+
+def _checksum_matches(body: str, check: str) -> bool:
+    """Compare a check segment against the one derived from the body."""
+    return hmac.compare_digest(check, _compute_check_segment(body))
 
 
 def _find_license_key() -> str | None:
@@ -131,41 +144,79 @@ def _find_license_key() -> str | None:
         return env_key.strip()
 
     for location in _LICENSE_LOCATIONS:
-        path = Path(location).expanduser()
-        if path.is_file():
-            try:
-                content = path.read_text().strip()
-                if content:
-                    return content
-            except OSError:
-                continue
+        # Open directly rather than stat first: a missing path or a directory
+        # fails the open with OSError, so the common miss costs one syscall.
+        # A key is 19 characters; the read cap keeps a stray large file cheap.
+        try:
+            with open(os.path.expanduser(location), encoding="utf-8", errors="replace") as fh:
+                content = fh.read(_LICENSE_READ_LIMIT).strip()
+        except OSError:
+            continue
+        if content:
+            return content
 
     return None
 
 
+def _location_stamps() -> tuple[tuple[int, int, int] | None, ...]:
+    """Identity and version of each license file location, None where absent."""
+    stamps: list[tuple[int, int, int] | None] = []
+    for location in _LICENSE_LOCATIONS:
+        try:
+            st = os.stat(os.path.expanduser(location))
+        except OSError:
+            stamps.append(None)
+        else:
+            stamps.append((st.st_ino, st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+
 def get_license_info() -> LicenseInfo:
-    """Detect and validate the current license."""
+    """Detect and validate the current license.
+
+    The result is cached for the process and recomputed when the license
+    environment variable, the search locations, or a license file changes.
+    Files are only checked when the environment variable is unset, since it
+    takes precedence over them.
+    """
+    env_key = os.environ.get(_ENV_LICENSE_KEY, "")
+    stamps = () if env_key.strip() else _location_stamps()
+    return _cached_license_info(env_key, tuple(_LICENSE_LOCATIONS), stamps)
+
+
+@lru_cache(maxsize=1)
+def _cached_license_info(
+    env_key: str,
+    locations: tuple[str, ...],
+    stamps: tuple[tuple[int, int, int] | None, ...],
+) -> LicenseInfo:
+    """Validate the license for one (environment, locations, file stamps) combination."""
     key = _find_license_key()
 
     if key is None:
         return LicenseInfo(tier=Tier.FREE)
 
-    if not _validate_key_format(key):
+    # One parse feeds both the format and the checksum check
+    parsed = _parse_key(key)
+    if parsed is None:
         logger.warning("Invalid license key format")
         return LicenseInfo(tier=Tier.FREE, license_key=key, valid=False)
 
-    if not _validate_key_checksum(key):
+    if not _checksum_matches(*parsed):
         logger.warning("License key checksum mismatch")
         return LicenseInfo(tier=Tier.FREE, license_key=key, valid=False)
 
     return LicenseInfo(tier=Tier.PRO, license_key=key, valid=True)
 
 
+def refresh_license() -> None:
+    """Drop the cached license so the next lookup re-reads it."""
+    _cached_license_info.cache_clear()
+
+
 def has_feature(feature: str) -> bool:
     """Check if the current license grants access to a feature."""
-    info = get_license_info()
-    tier_config = TIER_DEFINITIONS[info.tier]
-    return feature in tier_config.features
+    return feature in _TIER_FEATURES[get_license_info().tier]
 
 
 def is_pro() -> bool:
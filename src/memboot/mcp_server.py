@@ -2,17 +2,27 @@
 
 from __future__ import annotations
 
+import atexit
 from pathlib import Path
+from typing import Any
 
 from memboot.context import build_context
 from memboot.exceptions import MembootError
+from memboot.indexer import get_db_path
 from memboot.memory import remember as remember_fn
 from memboot.models import MemoryType
 from memboot.query import search
+from memboot.store import MembootStore
 
+# One query_memory result row: source, score, content.
+_RESULT_ROW = "**%s** (score: %.3f)\n%s"
 
-def create_mcp_server(project_path: Path):
-    """Create an MCP server with memboot tools."""
+
+def _require_mcp() -> tuple[Any, Any, Any]:
+    """Import the optional mcp SDK, returning its (Server, TextContent, Tool).
+
+    Raises MembootError if the SDK is not installed.
+    """
     try:
         from mcp.server import Server
         from mcp.types import TextContent, Tool
@@ -20,9 +30,37 @@ def create_mcp_server(project_path: Path):
         raise MembootError(
             "MCP server requires the mcp SDK. Install with: pip install memboot[mcp]"
         ) from exc
+    return Server, TextContent, Tool
+
+
+def create_mcp_server(project_path: Path):
+    """Create an MCP server with memboot tools."""
+    Server, TextContent, Tool = _require_mcp()  # noqa: N806 - the SDK class names
 
     server = Server("memboot")
 
+    # One connection for the server's lifetime instead of one per tool call. It is
+    # opened on first use once the project's index exists, so a server started
+    # before `memboot init` still reports the missing index.
+    store: MembootStore | None = None
+
+    def get_store() -> MembootStore | None:
+        nonlocal store
+        if store is None:
+            db_path = get_db_path(project_path.resolve())
+            if not db_path.exists():
+                return None
+            store = MembootStore(db_path)
+        return store
+
+    def close_store() -> None:
+        nonlocal store
+        if store is not None:
+            store.close()
+            store = None
+
+    atexit.register(close_store)
+
     @server.list_tools()
     async def list_tools():
         return [
@@ -71,15 +109,17 @@ def create_mcp_server(project_path: Path):
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict):
+        return run_tool(name, arguments)
+
+    def run_tool(name: str, arguments: dict[str, Any]) -> list[Any]:
         if name == "query_memory":
             results = search(
                 arguments["query"],
                 project_path,
                 top_k=arguments.get("top_k", 5),
+                store=get_store(),
             )
-            formatted = "\n\n".join(
-                f"**{r.source}** (score: {r.score:.3f})\n{r.content}" for r in results
-            )
+            formatted = "\n\n".join([_RESULT_ROW % (r.source, r.score, r.content) for r in results])
             return [TextContent(type="text", text=formatted or "No results found.")]
 
         elif name == "remember":
@@ -89,6 +129,7 @@ def create_mcp_server(project_path: Path):
                 memory_type=mem_type,
                 project_path=project_path,
                 tags=arguments.get("tags"),
+                store=get_store(),
             )
             return [
                 TextContent(
@@ -102,6 +143,7 @@ def create_mcp_server(project_path: Path):
                 arguments["query"],
                 project_path,
                 max_tokens=arguments.get("max_tokens", 4000),
+                store=get_store(),
             )
             return [TextContent(type="text", text=ctx)]
 
@@ -112,13 +154,8 @@ def create_mcp_server(project_path: Path):
 
 async def run_server(project_path: Path) -> None:
     """Run the MCP stdio server."""
-    try:
-        from mcp.server.stdio import stdio_server
-    except ImportError as exc:
-        raise MembootError(
-            "MCP server requires the mcp SDK. Install with: pip install memboot[mcp]"
-        ) from exc
+    server = create_mcp_server(project_path)  # checks the SDK is installed
+    from mcp.server.stdio import stdio_server
 
-    server = create_mcp_server(project_path)
     async with stdio_server() as (read, write):
         await server.run(read, write, server.create_initialization_options())
@@ -2,24 +2,18 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from uuid import uuid4
 
-from memboot.embedder import TfidfEmbedder, get_embedder
+from memboot.embedder import BaseEmbedder, TfidfEmbedder, load_embedder
 from memboot.indexer import get_db_path
 from memboot.models import Memory, MemoryType
 from memboot.store import MembootStore
 
 
-def _restore_embedder(store: MembootStore):
-    """Restore embedder from store metadata."""
-    backend = store.get_meta("embedding_backend") or "tfidf"
-    if backend == "tfidf":
-        state_json = store.get_meta("tfidf_state")
-        if state_json:
-            return TfidfEmbedder.from_state(json.loads(state_json))
-    return get_embedder(backend)
+def _restore_embedder(store: MembootStore) -> BaseEmbedder:
+    """Restore embedder from store metadata, or a fresh TF-IDF one if none is fitted."""
+    return load_embedder(store) or TfidfEmbedder()
 
 
 def remember(
@@ -27,10 +21,15 @@ def remember(
     memory_type: MemoryType,
     project_path: Path,
     tags: list[str] | None = None,
+    store: MembootStore | None = None,
 ) -> Memory:
-    """Store an episodic memory."""
-    db_path = get_db_path(project_path.resolve())
-    store = MembootStore(db_path)
+    """Store an episodic memory.
+
+    Pass an open ``store`` to reuse its connection; it is left open.
+    """
+    owns_store = store is None
+    if store is None:
+        store = MembootStore(get_db_path(project_path.resolve()))
     try:
         embedder = _restore_embedder(store)
         # For TF-IDF without state, fit on just this text (won't be great but works)
@@ -38,7 +37,7 @@ def remember(
             embedder.fit([content])
         embedding = embedder.embed_text(content)
         memory = Memory(
-            id=str(uuid4()),
+            id=uuid4().hex,
             content=content,
             memory_type=memory_type,
             embedding=embedding.tolist(),
@@ -47,26 +46,42 @@ def remember(
         store.add_memory(memory)
         return memory
     finally:
-        store.close()
+        if owns_store:
+            store.close()
 
 
 def list_memories(
     project_path: Path,
     memory_type: MemoryType | None = None,
+    store: MembootStore | None = None,
 ) -> list[Memory]:
-    """List all memories for a project."""
+    """List all memories for a project.
+
+    Pass an open ``store`` to reuse its connection; it is left open.
+    """
+    if store is not None:
+        return store.list_memories(memory_type)
     db_path = get_db_path(project_path.resolve())
     if not db_path.exists():
         return []
-    store = MembootStore(db_path)
+    store = MembootStore(db_path, readonly=True)
     try:
         return store.list_memories(memory_type)
     finally:
         store.close()
 
 
-def delete_memory(memory_id: str, project_path: Path) -> bool:
-    """Delete a memory by ID."""
+def delete_memory(
+    memory_id: str,
+    project_path: Path,
+    store: MembootStore | None = None,
+) -> bool:
+    """Delete a memory by ID.
+
+    Pass an open ``store`` to reuse its connection; it is left open.
+    """
+    if store is not None:
+        return store.delete_memory(memory_id)
     db_path = get_db_path(project_path.resolve())
     if not db_path.exists():
         return False
@@ -2,34 +2,38 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 import numpy as np
 
-from memboot.embedder import TfidfEmbedder, get_embedder
+from memboot.embedder import BaseEmbedder, load_embedder
 from memboot.exceptions import QueryError
 from memboot.indexer import get_db_path
 from memboot.models import SearchResult
 from memboot.store import MembootStore
 
 
-def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
-    """Cosine similarity between two L2-normalized vectors (= dot product)."""
-    return float(np.dot(a, b))
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, ties kept in input order."""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < scores.size:
+        # Partition out the k-th best score, then keep everything tied with it so
+        # the final ordering matches a full stable sort
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(scores.size)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
 
 
-def _restore_embedder(store: MembootStore):
+def _restore_embedder(store: MembootStore) -> BaseEmbedder:
     """Restore the embedder from stored state."""
-    backend = store.get_meta("embedding_backend") or "tfidf"
-    if backend == "tfidf":
-        state_json = store.get_meta("tfidf_state")
-        if state_json is None:
-            raise QueryError("No TF-IDF state found. Run 'memboot init' first.")
-        state = json.loads(state_json)
-        return TfidfEmbedder.from_state(state)
-    else:
-        return get_embedder(backend)
+    embedder = load_embedder(store)
+    if embedder is None:
+        raise QueryError("No TF-IDF state found. Run 'memboot init' first.")
+    return embedder
 
 
 def search(
@@ -37,40 +41,51 @@ def search(
     project_path: Path,
     top_k: int = 5,
     include_memories: bool = True,
+    store: MembootStore | None = None,
 ) -> list[SearchResult]:
-    """Search chunks and memories by similarity."""
-    db_path = get_db_path(project_path.resolve())
-    if not db_path.exists():
-        raise QueryError(f"No index found for {project_path}. Run 'memboot init' first.")
+    """Search chunks and memories by similarity.
 
-    store = MembootStore(db_path)
+    Pass an open ``store`` to reuse its connection; it is left open.
+    """
+    owns_store = store is None
+    if store is None:
+        db_path = get_db_path(project_path.resolve())
+        if not db_path.exists():
+            raise QueryError(f"No index found for {project_path}. Run 'memboot init' first.")
+        store = MembootStore(db_path, readonly=True)
 
     try:
         embedder = _restore_embedder(store)
         query_vec = embedder.embed_text(query_text)
 
-        scored: list[tuple[str, float, str]] = []  # (id, score, type)
-
-        # Score chunks
-        for chunk_id, emb in store.get_all_chunk_embeddings():
-            score = cosine_similarity(query_vec, emb)
-            scored.append((chunk_id, score, "chunk"))
+        # Score every row with one matrix-vector product per table (rows are
+        # L2-normalized, so the dot product is the cosine similarity)
+        ids, matrix = store.get_chunk_embedding_matrix()
+        types = ["chunk"] * len(ids)
+        scores = matrix @ query_vec if ids else np.empty(0, dtype=np.float32)
 
-        # Score memories
         if include_memories:
-            for mem_id, emb in store.get_all_memory_embeddings():
-                score = cosine_similarity(query_vec, emb)
-                scored.append((mem_id, score, "memory"))
-
-        # Sort by score descending
-        scored.sort(key=lambda x: x[1], reverse=True)
-        top = scored[:top_k]
-
-        # Hydrate results
+            mem_ids, mem_matrix = store.get_memory_embedding_matrix()
+            if mem_ids:
+                ids = ids + mem_ids
+                types += ["memory"] * len(mem_ids)
+                scores = np.concatenate((scores, mem_matrix @ query_vec))
+
+        top = [(ids[i], float(scores[i]), types[i]) for i in _top_k_indices(scores, top_k)]
+
+        # Hydrate results with one query per table, skipping the embedding BLOBs
+        chunks = store.get_chunks(
+            [item_id for item_id, _, item_type in top if item_type == "chunk"],
+            include_embeddings=False,
+        )
+        memories = store.get_memories(
+            [item_id for item_id, _, item_type in top if item_type == "memory"],
+            include_embeddings=False,
+        )
         results: list[SearchResult] = []
         for item_id, score, item_type in top:
             if item_type == "memory":
-                mem = store.get_memory(item_id)
+                mem = memories.get(item_id)
                 if mem:
                     results.append(
                         SearchResult(
@@ -80,7 +95,7 @@ def search(
                         )
                     )
             else:
-                chunk = store.get_chunk(item_id)
+                chunk = chunks.get(item_id)
                 if chunk:
                     results.append(
                         SearchResult(
@@ -95,4 +110,5 @@ def search(
 
         return results
     finally:
-        store.close()
+        if owns_store:
+            store.close()
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 
@@ -41,63 +44,172 @@ CREATE TABLE IF NOT EXISTS file_meta (
     path TEXT PRIMARY KEY,
     mtime REAL NOT NULL,
     size INTEGER NOT NULL,
-    chunk_count INTEGER NOT NULL DEFAULT 0
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT
 );
+
+CREATE INDEX IF NOT EXISTS idx_chunks_source_file ON chunks(source_file);
+CREATE INDEX IF NOT EXISTS idx_memories_type_created ON memories(memory_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_memories_created ON memories(created_at);
 """
 
+# Applied to every new connection. journal_mode persists in the database file; the
+# rest are per-connection settings. WAL + synchronous=NORMAL avoids an fsync per commit.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # must stay first; skipped for read-only connections
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Column lists matching _row_to_chunk/_row_to_memory. The *_NO_EMBEDDING variants
+# select NULL in place of the BLOB for callers that only need text and metadata.
+_CHUNK_COLUMNS = "id, content, source_file, start_line, end_line, chunk_type, embedding, created_at"
+_CHUNK_COLUMNS_NO_EMBEDDING = _CHUNK_COLUMNS.replace("embedding", "NULL")
+_MEMORY_COLUMNS = "id, content, memory_type, embedding, tags, created_at"
+_MEMORY_COLUMNS_NO_EMBEDDING = _MEMORY_COLUMNS.replace("embedding", "NULL")
+
+_INSERT_CHUNK = f"INSERT OR REPLACE INTO chunks ({_CHUNK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_MEMORY = f"INSERT OR REPLACE INTO memories ({_MEMORY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+
+# Stored enum values to members, for row conversion without going through Enum.__call__
+_CHUNK_TYPES = {member.value: member for member in ChunkType}
+_MEMORY_TYPES = {member.value: member for member in MemoryType}
+
+# Bound parameters per IN (...) list, under SQLite's historic 999-variable limit
+_IN_BATCH = 900
+
+
+def _embedding_to_blob(embedding: list[float] | None) -> bytes | None:
+    """Serialize an embedding as a float32 BLOB; empty or missing becomes NULL."""
+    if not embedding:
+        return None
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def _blob_to_embedding(blob: bytes) -> list[float]:
+    """Decode a float32 BLOB back into the models' list[float] form."""
+    values: list[float] = np.frombuffer(blob, dtype=np.float32).tolist()
+    return values
+
 
 class MembootStore:
     """SQLite store with numpy embedding support."""
 
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(self, db_path: str | Path, readonly: bool = False) -> None:
+        """Open (creating if needed) the store at db_path.
+
+        With ``readonly=True`` the database must already exist: it is opened
+        read-only and neither the directory nor the schema is touched.
+        """
         self._db_path = Path(db_path)
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._readonly = readonly
         self._conn: sqlite3.Connection | None = None
-        self._init_db()
+        self._in_transaction = False
+        # table -> (data version, ids, matrix); see _embedding_matrix
+        self._matrix_cache: dict[str, tuple[tuple[int, int], list[str], np.ndarray]] = {}
+        if not readonly:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._init_db()
 
     def _get_conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            self._conn = sqlite3.connect(str(self._db_path))
-            self._conn.execute("PRAGMA journal_mode=WAL")
+            pragmas: tuple[str, ...]
+            if self._readonly:
+                uri = self._db_path.resolve().as_uri() + "?mode=ro"
+                try:
+                    self._conn = sqlite3.connect(uri, uri=True, isolation_level=None)
+                except sqlite3.Error as exc:
+                    raise StoreError(f"Cannot open {self._db_path} read-only: {exc}") from exc
+                # journal_mode is persistent and a read-only connection cannot set it
+                pragmas = _PRAGMAS[1:]
+            else:
+                self._conn = sqlite3.connect(str(self._db_path), isolation_level=None)
+                pragmas = _PRAGMAS
+            for pragma in pragmas:
+                self._conn.execute(pragma)
         return self._conn
 
     def _init_db(self) -> None:
         conn = self._get_conn()
         conn.executescript(_SCHEMA)
-        conn.commit()
+        # Databases created before content hashing lack the column
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(file_meta)")}
+        if "content_hash" not in columns:
+            conn.execute("ALTER TABLE file_meta ADD COLUMN content_hash TEXT")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Group writes into a single transaction.
+
+        The connection runs in autocommit mode (isolation_level=None), so single
+        statements commit on their own and multi-statement store methods open
+        one of these blocks. The block commits on exit or rolls back if it
+        raises; nested blocks, including those store methods, join the outer one.
+        """
+        conn = self._get_conn()
+        if self._in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        self._in_transaction = True
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            # total_changes does not go back down on rollback, so a matrix read
+            # inside this block would otherwise stay cached with the undone rows
+            self._matrix_cache.clear()
+            raise
+        else:
+            conn.commit()
+        finally:
+            self._in_transaction = False
 
     # -- Chunk operations --
 
-    def add_chunks(self, chunks: list[Chunk]) -> int:
-        """Insert chunks. Returns count added."""
-        conn = self._get_conn()
-        added = 0
-        for chunk in chunks:
-            emb_blob = (
-                np.array(chunk.embedding, dtype=np.float32).tobytes() if chunk.embedding else None
-            )
-            try:
-                conn.execute(
-                    "INSERT OR REPLACE INTO chunks "
-                    "(id, content, source_file, start_line, end_line, "
-                    "chunk_type, embedding, created_at) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        chunk.id,
-                        chunk.content,
-                        chunk.source_file,
-                        chunk.start_line,
-                        chunk.end_line,
-                        chunk.chunk_type.value if chunk.chunk_type else None,
-                        emb_blob,
-                        chunk.created_at,
-                    ),
+    def add_chunks(self, chunks: list[Chunk], embeddings: np.ndarray | None = None) -> int:
+        """Insert chunks. Returns count added.
+
+        If ``embeddings`` is given, row i is stored as the embedding of chunks[i]
+        straight from the matrix, and ``chunk.embedding`` is ignored.
+        """
+        matrix = None
+        if embeddings is not None:
+            matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+            if matrix.shape[0] != len(chunks):
+                raise StoreError(
+                    f"Embedding matrix has {matrix.shape[0]} rows for {len(chunks)} chunks"
                 )
-                added += 1
+        failed: list[str] = []  # id of the row being bound, for the error message
+
+        def rows() -> Iterator[tuple[Any, ...]]:
+            for i, chunk in enumerate(chunks):
+                failed[:] = [chunk.id]
+                yield (
+                    chunk.id,
+                    chunk.content,
+                    chunk.source_file,
+                    chunk.start_line,
+                    chunk.end_line,
+                    chunk.chunk_type.value if chunk.chunk_type else None,
+                    memoryview(matrix[i])
+                    if matrix is not None
+                    else _embedding_to_blob(chunk.embedding),
+                    chunk.created_at,
+                )
+
+        # One executemany per batch, fed lazily: the rows are bound and stepped in C
+        # without a Python-level execute per chunk. Materializing the row list first
+        # costs about what the loop saves, so keep rows() a generator.
+        with self.transaction() as conn:
+            try:
+                conn.executemany(_INSERT_CHUNK, rows())
             except sqlite3.Error as exc:
-                raise StoreError(f"Failed to add chunk {chunk.id}: {exc}") from exc
-        conn.commit()
-        return added
+                raise StoreError(f"Failed to add chunk {failed[0]}: {exc}") from exc
+        return len(chunks)
 
     def get_chunk(self, chunk_id: str) -> Chunk | None:
         """Retrieve a chunk by ID."""
@@ -107,10 +219,21 @@ class MembootStore:
             return None
         return self._row_to_chunk(row)
 
-    def get_chunks_by_file(self, source_file: str) -> list[Chunk]:
+    def get_chunks(
+        self, chunk_ids: Sequence[str], include_embeddings: bool = True
+    ) -> dict[str, Chunk]:
+        """Retrieve several chunks by ID. Missing IDs are left out of the result."""
+        columns = _CHUNK_COLUMNS if include_embeddings else _CHUNK_COLUMNS_NO_EMBEDDING
+        rows = self._select_in(columns, "chunks", "id", chunk_ids)
+        return {row[0]: self._row_to_chunk(row) for row in rows}
+
+    def get_chunks_by_file(self, source_file: str, include_embeddings: bool = True) -> list[Chunk]:
         """Retrieve all chunks from a specific file."""
+        columns = _CHUNK_COLUMNS if include_embeddings else _CHUNK_COLUMNS_NO_EMBEDDING
         conn = self._get_conn()
-        rows = conn.execute("SELECT * FROM chunks WHERE source_file = ?", (source_file,)).fetchall()
+        rows = conn.execute(
+            f"SELECT {columns} FROM chunks WHERE source_file = ?", (source_file,)
+        ).fetchall()
         return [self._row_to_chunk(r) for r in rows]
 
     def count_chunks(self) -> int:
@@ -121,51 +244,52 @@ class MembootStore:
 
     def clear_chunks(self) -> int:
         """Delete all chunks and file metadata. Returns chunk count deleted."""
-        count = self.count_chunks()
-        conn = self._get_conn()
-        conn.execute("DELETE FROM chunks")
-        conn.execute("DELETE FROM file_meta")
-        conn.commit()
+        with self.transaction() as conn:
+            count = self.count_chunks()
+            conn.execute("DELETE FROM chunks")
+            conn.execute("DELETE FROM file_meta")
         return count
 
     def get_all_chunk_embeddings(self) -> list[tuple[str, np.ndarray]]:
         """Load all chunk embeddings for vector search."""
-        conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT id, embedding FROM chunks WHERE embedding IS NOT NULL"
-        ).fetchall()
-        results = []
-        for chunk_id, emb_blob in rows:
-            arr = np.frombuffer(emb_blob, dtype=np.float32)
-            results.append((chunk_id, arr))
-        return results
+        return list(self.iter_chunk_embeddings())
+
+    def iter_chunk_embeddings(self) -> Iterator[tuple[str, np.ndarray]]:
+        """Yield (id, embedding) per chunk as rows are read from the cursor."""
+        return self._iter_embeddings("chunks")
+
+    def get_chunk_embedding_matrix(self) -> tuple[list[str], np.ndarray]:
+        """Load all chunk embeddings as ids plus one (N, D) float32 matrix."""
+        return self._embedding_matrix("chunks")
 
     # -- Memory operations --
 
     def add_memory(self, memory: Memory) -> None:
         """Insert a single memory."""
-        conn = self._get_conn()
-        emb_blob = (
-            np.array(memory.embedding, dtype=np.float32).tobytes() if memory.embedding else None
-        )
-        tags_json = json.dumps(memory.tags) if memory.tags else "[]"
-        try:
-            conn.execute(
-                "INSERT OR REPLACE INTO memories "
-                "(id, content, memory_type, embedding, tags, created_at) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (
+        self.add_memories([memory])
+
+    def add_memories(self, memories: list[Memory]) -> int:
+        """Insert several memories with a single commit. Returns count added."""
+        failed: list[str] = []  # id of the row being bound, for the error message
+
+        def rows() -> Iterator[tuple[Any, ...]]:
+            for memory in memories:
+                failed[:] = [memory.id]
+                yield (
                     memory.id,
                     memory.content,
                     memory.memory_type.value,
-                    emb_blob,
-                    tags_json,
+                    _embedding_to_blob(memory.embedding),
+                    json.dumps(memory.tags) if memory.tags else "[]",
                     memory.created_at,
-                ),
-            )
-            conn.commit()
-        except sqlite3.Error as exc:
-            raise StoreError(f"Failed to add memory {memory.id}: {exc}") from exc
+                )
+
+        with self.transaction() as conn:
+            try:
+                conn.executemany(_INSERT_MEMORY, rows())
+            except sqlite3.Error as exc:
+                raise StoreError(f"Failed to add memory {failed[0]}: {exc}") from exc
+        return len(memories)
 
     def get_memory(self, memory_id: str) -> Memory | None:
         """Retrieve a memory by ID."""
@@ -175,23 +299,34 @@ class MembootStore:
             return None
         return self._row_to_memory(row)
 
-    def list_memories(self, memory_type: MemoryType | None = None) -> list[Memory]:
+    def get_memories(
+        self, memory_ids: Sequence[str], include_embeddings: bool = True
+    ) -> dict[str, Memory]:
+        """Retrieve several memories by ID. Missing IDs are left out of the result."""
+        columns = _MEMORY_COLUMNS if include_embeddings else _MEMORY_COLUMNS_NO_EMBEDDING
+        rows = self._select_in(columns, "memories", "id", memory_ids)
+        return {row[0]: self._row_to_memory(row) for row in rows}
+
+    def list_memories(
+        self, memory_type: MemoryType | None = None, include_embeddings: bool = True
+    ) -> list[Memory]:
         """List all memories, optionally filtered by type."""
+        columns = _MEMORY_COLUMNS if include_embeddings else _MEMORY_COLUMNS_NO_EMBEDDING
         conn = self._get_conn()
         if memory_type:
-            rows = conn.execute(
-                "SELECT * FROM memories WHERE memory_type = ? ORDER BY created_at DESC",
+            cursor = conn.execute(
+                f"SELECT {columns} FROM memories WHERE memory_type = ? ORDER BY created_at DESC",
                 (memory_type.value,),
-            ).fetchall()
+            )
         else:
-            rows = conn.execute("SELECT * FROM memories ORDER BY created_at DESC").fetchall()
-        return [self._row_to_memory(r) for r in rows]
+            cursor = conn.execute(f"SELECT {columns} FROM memories ORDER BY created_at DESC")
+        # Convert rows as the cursor yields them rather than via an intermediate fetchall()
+        return [self._row_to_memory(r) for r in cursor]
 
     def delete_memory(self, memory_id: str) -> bool:
         """Delete a memory. Returns True if found and deleted."""
         conn = self._get_conn()
         cursor = conn.execute("DELETE FROM memories WHERE id = ?", (memory_id,))
-        conn.commit()
         return cursor.rowcount > 0
 
     def count_memories(self) -> int:
@@ -202,23 +337,73 @@ class MembootStore:
 
     def clear_memories(self) -> int:
         """Delete all memories. Returns count deleted."""
-        count = self.count_memories()
-        conn = self._get_conn()
-        conn.execute("DELETE FROM memories")
-        conn.commit()
+        with self.transaction() as conn:
+            count = self.count_memories()
+            conn.execute("DELETE FROM memories")
         return count
 
     def get_all_memory_embeddings(self) -> list[tuple[str, np.ndarray]]:
         """Load all memory embeddings for vector search."""
+        return list(self.iter_memory_embeddings())
+
+    def iter_memory_embeddings(self) -> Iterator[tuple[str, np.ndarray]]:
+        """Yield (id, embedding) per memory as rows are read from the cursor."""
+        return self._iter_embeddings("memories")
+
+    def get_memory_embedding_matrix(self) -> tuple[list[str], np.ndarray]:
+        """Load all memory embeddings as ids plus one (N, D) float32 matrix."""
+        return self._embedding_matrix("memories")
+
+    def _embedding_matrix(self, table: str) -> tuple[list[str], np.ndarray]:
+        """Stack a table's embeddings into a preallocated (N, D) float32 matrix.
+
+        The result is cached on the store and reused until the database changes:
+        ``PRAGMA data_version`` moves on commits from other connections and
+        ``total_changes`` on this connection's own writes. Callers must treat
+        the returned ids and matrix as read-only.
+        """
         conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT id, embedding FROM memories WHERE embedding IS NOT NULL"
-        ).fetchall()
-        results = []
-        for mem_id, emb_blob in rows:
-            arr = np.frombuffer(emb_blob, dtype=np.float32)
-            results.append((mem_id, arr))
-        return results
+        version = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+        cached = self._matrix_cache.get(table)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        # Size the matrix from a count and fill it straight from the cursor, so the
+        # BLOBs and the matrix are never held in memory together. Both statements
+        # run in one read transaction, so they see the same snapshot.
+        owns_txn = not conn.in_transaction
+        if owns_txn:
+            conn.execute("BEGIN")
+        try:
+            count = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE embedding IS NOT NULL")
+            cursor = conn.execute(f"SELECT id, embedding FROM {table} WHERE embedding IS NOT NULL")
+            ids: list[str] = []
+            matrix = np.empty((0, 0), dtype=np.float32)
+            for i, (row_id, emb_blob) in enumerate(cursor):
+                if i == 0:
+                    dim = len(emb_blob) // 4
+                    matrix = np.empty((count.fetchone()[0], dim), dtype=np.float32)
+                elif len(emb_blob) != 4 * dim:
+                    raise StoreError(
+                        f"Embedding dimension mismatch in {table}: {row_id} has "
+                        f"{len(emb_blob) // 4}, expected {dim}"
+                    )
+                matrix[i] = np.frombuffer(emb_blob, dtype=np.float32)
+                ids.append(row_id)
+        finally:
+            if owns_txn:
+                conn.commit()
+        matrix.flags.writeable = False
+        self._matrix_cache[table] = (version, ids, matrix)
+        return ids, matrix
+
+    def _iter_embeddings(self, table: str) -> Iterator[tuple[str, np.ndarray]]:
+        """Yield (id, embedding) rows of a table without materializing them all."""
+        cursor = self._get_conn().execute(
+            f"SELECT id, embedding FROM {table} WHERE embedding IS NOT NULL"
+        )
+        for row_id, emb_blob in cursor:
+            yield row_id, np.frombuffer(emb_blob, dtype=np.float32)
 
     # -- Meta operations --
 
@@ -226,7 +411,6 @@ class MembootStore:
         """Set a metadata key-value pair."""
         conn = self._get_conn()
         conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
-        conn.commit()
 
     def get_meta(self, key: str) -> str | None:
         """Get a metadata value by key."""
@@ -234,16 +418,46 @@ class MembootStore:
         row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
         return row[0] if row else None
 
+    def set_meta_blob(self, key: str, value: bytes) -> None:
+        """Set a binary metadata value, stored as a BLOB."""
+        conn = self._get_conn()
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def get_meta_blob(self, key: str) -> bytes | None:
+        """Get a binary metadata value by key."""
+        conn = self._get_conn()
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row and isinstance(row[0], bytes) else None
+
+    def delete_meta(self, key: str) -> bool:
+        """Delete a metadata key. Returns True if it existed."""
+        conn = self._get_conn()
+        cursor = conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
     # -- File meta operations --
 
-    def set_file_meta(self, path: str, mtime: float, size: int, chunk_count: int) -> None:
+    def set_file_meta(
+        self,
+        path: str,
+        mtime: float,
+        size: int,
+        chunk_count: int,
+        content_hash: str | None = None,
+    ) -> None:
         """Store file metadata for incremental reindexing."""
-        conn = self._get_conn()
-        conn.execute(
-            "INSERT OR REPLACE INTO file_meta (path, mtime, size, chunk_count) VALUES (?, ?, ?, ?)",
-            (path, mtime, size, chunk_count),
-        )
-        conn.commit()
+        self.set_file_meta_many([(path, mtime, size, chunk_count, content_hash)])
+
+    def set_file_meta_many(
+        self, entries: Iterable[tuple[str, float, int, int, str | None]]
+    ) -> None:
+        """Store (path, mtime, size, chunk_count, content_hash) for many files at once."""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO file_meta (path, mtime, size, chunk_count, content_hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                entries,
+            )
 
     def get_all_file_meta(self) -> dict[str, tuple[float, int, int]]:
         """Get all stored file metadata. Returns {path: (mtime, size, chunk_count)}."""
@@ -251,36 +465,78 @@ class MembootStore:
         rows = conn.execute("SELECT path, mtime, size, chunk_count FROM file_meta").fetchall()
         return {path: (mtime, size, chunk_count) for path, mtime, size, chunk_count in rows}
 
+    def get_file_hashes(self) -> dict[str, str]:
+        """Get stored content hashes. Returns {path: content_hash} for hashed files."""
+        conn = self._get_conn()
+        rows = conn.execute(
+            "SELECT path, content_hash FROM file_meta WHERE content_hash IS NOT NULL"
+        ).fetchall()
+        return dict(rows)
+
     def delete_file_meta(self, path: str) -> bool:
         """Delete file metadata for a path. Returns True if found."""
         conn = self._get_conn()
         cursor = conn.execute("DELETE FROM file_meta WHERE path = ?", (path,))
-        conn.commit()
         return cursor.rowcount > 0
 
     def clear_file_meta(self) -> None:
         """Delete all file metadata."""
         conn = self._get_conn()
         conn.execute("DELETE FROM file_meta")
-        conn.commit()
 
     def delete_chunks_by_file(self, source_file: str) -> int:
         """Delete all chunks for a specific file. Returns count deleted."""
         conn = self._get_conn()
         cursor = conn.execute("DELETE FROM chunks WHERE source_file = ?", (source_file,))
-        conn.commit()
         return cursor.rowcount
 
+    def delete_chunks_by_files(self, source_files: Sequence[str]) -> int:
+        """Delete all chunks for several files. Returns count deleted."""
+        with self.transaction():
+            return self._delete_in("chunks", "source_file", source_files)
+
+    def delete_file_metas(self, paths: Sequence[str]) -> int:
+        """Delete file metadata for several paths. Returns count deleted."""
+        with self.transaction():
+            return self._delete_in("file_meta", "path", paths)
+
+    def _select_in(
+        self, columns: str, table: str, column: str, values: Sequence[str]
+    ) -> list[tuple[Any, ...]]:
+        """SELECT rows whose column is in values, one statement per batch."""
+        conn = self._get_conn()
+        rows: list[tuple[Any, ...]] = []
+        for start in range(0, len(values), _IN_BATCH):
+            batch = values[start : start + _IN_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            rows += conn.execute(
+                f"SELECT {columns} FROM {table} WHERE {column} IN ({placeholders})",
+                batch,
+            ).fetchall()
+        return rows
+
+    def _delete_in(self, table: str, column: str, values: Sequence[str]) -> int:
+        """DELETE rows whose column is in values, one statement per batch."""
+        conn = self._get_conn()
+        deleted = 0
+        for start in range(0, len(values), _IN_BATCH):
+            batch = values[start : start + _IN_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            cursor = conn.execute(
+                f"DELETE FROM {table} WHERE {column} IN ({placeholders})",
+                batch,
+            )
+            deleted += cursor.rowcount
+        return deleted
+
     # -- Lifecycle --
 
     def reset(self) -> None:
         """Drop and recreate all tables."""
-        conn = self._get_conn()
-        conn.executescript(
-            "DROP TABLE IF EXISTS chunks; DROP TABLE IF EXISTS memories;"
-            " DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS file_meta;"
-        )
-        conn.commit()
+        with self.transaction() as conn:
+            for table in ("chunks", "memories", "meta", "file_meta"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self._matrix_cache.clear()  # DROP TABLE does not count towards total_changes
         self._init_db()
 
     def close(self) -> None:
@@ -288,38 +544,40 @@ class MembootStore:
         if self._conn is not None:
             self._conn.close()
             self._conn = None
+        self._matrix_cache.clear()
 
     # -- Internal helpers --
 
     @staticmethod
     def _row_to_chunk(row: tuple) -> Chunk:
         chunk_id, content, source_file, start_line, end_line, chunk_type, emb_blob, created_at = row
-        embedding = None
-        if emb_blob is not None:
-            embedding = np.frombuffer(emb_blob, dtype=np.float32).tolist()
-        return Chunk(
+        chunk = Chunk(
             id=chunk_id,
             content=content,
             source_file=source_file,
             start_line=start_line,
             end_line=end_line,
-            chunk_type=ChunkType(chunk_type) if chunk_type else ChunkType.WINDOW,
-            embedding=embedding,
+            chunk_type=_CHUNK_TYPES[chunk_type] if chunk_type else ChunkType.WINDOW,
             created_at=created_at,
         )
+        if emb_blob is not None:
+            # Assigned after construction: tolist() already yields Python floats,
+            # so per-element validation would only copy the list again
+            chunk.embedding = _blob_to_embedding(emb_blob)
+        return chunk
 
     @staticmethod
     def _row_to_memory(row: tuple) -> Memory:
         mem_id, content, memory_type, emb_blob, tags_json, created_at = row
-        embedding = None
-        if emb_blob is not None:
-            embedding = np.frombuffer(emb_blob, dtype=np.float32).tolist()
-        tags = json.loads(tags_json) if tags_json else []
-        return Memory(
+        # Most memories are untagged; skip the JSON parser for the stored "[]"
+        tags = json.loads(tags_json) if tags_json and tags_json != "[]" else []
+        memory = Memory(
             id=mem_id,
             content=content,
-            memory_type=MemoryType(memory_type),
-            embedding=embedding,
+            memory_type=_MEMORY_TYPES[memory_type],
             tags=tags,
             created_at=created_at,
         )
+        if emb_blob is not None:
+            memory.embedding = _blob_to_embedding(emb_blob)
+        return memory
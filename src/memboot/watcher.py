@@ -2,14 +2,36 @@
 
 from __future__ import annotations
 
+import os
 import threading
 import time
+from collections.abc import Callable
 from pathlib import Path
 
 from memboot.exceptions import MembootError
 from memboot.models import MembootConfig
 
 
+def _relevance_filter(project_path: Path, config: MembootConfig) -> Callable[[str], bool]:
+    """Build the per-event path filter for a resolved project root.
+
+    Events can arrive by the thousand during checkouts or installs, so the
+    filter works on plain strings with everything it needs precomputed.
+    """
+    extensions = frozenset(config.file_extensions)
+    ignore = frozenset(config.ignore_patterns)
+    root_prefix = os.path.join(str(project_path), "")
+
+    def is_relevant(path: str) -> bool:
+        if os.path.splitext(path)[1].lower() not in extensions:
+            return False
+        if not path.startswith(root_prefix):
+            return False
+        return ignore.isdisjoint(path[len(root_prefix) :].split(os.sep))
+
+    return is_relevant
+
+
 def watch_project(
     project_path: Path,
     config: MembootConfig | None = None,
@@ -39,41 +61,44 @@ def watch_project(
 
     config = config or MembootConfig()
     project_path = project_path.resolve()
-    extensions = set(config.file_extensions)
-
-    timer: threading.Timer | None = None
-    lock = threading.Lock()
-
-    def _do_reindex():
-        nonlocal timer
-        try:
-            info = index_project(project_path, config=config)
-            if on_reindex:
-                on_reindex(info)
-        except Exception:
-            pass  # Callback handles display; don't crash the watcher
-
-    def _schedule_reindex():
-        nonlocal timer
-        with lock:
-            if timer is not None:
-                timer.cancel()
-            timer = threading.Timer(debounce, _do_reindex)
-            timer.daemon = True
-            timer.start()
+    is_relevant = _relevance_filter(project_path, config)
+
+    # One long-lived worker waits out the debounce window instead of a Timer thread
+    # per event. State below is guarded by the condition's lock.
+    wake = threading.Condition()
+    pending = False  # a relevant change arrived since the last reindex started
+    deadline = 0.0  # monotonic time the latest change's debounce window ends
+    stopped = False
+
+    def _worker() -> None:
+        nonlocal pending
+        while True:
+            with wake:
+                while not stopped and (not pending or time.monotonic() < deadline):
+                    wake.wait(deadline - time.monotonic() if pending else None)
+                if stopped:
+                    return
+                # Changes arriving during the reindex below queue exactly one more run
+                pending = False
+            try:
+                info = index_project(project_path, config=config)
+                if on_reindex:
+                    on_reindex(info)
+            except Exception:
+                pass  # Callback handles display; don't crash the watcher
+
+    def _schedule_reindex() -> None:
+        nonlocal pending, deadline
+        with wake:
+            idle = not pending
+            pending = True
+            deadline = time.monotonic() + debounce
+            if idle:
+                wake.notify()  # a worker already waiting re-checks the deadline itself
 
     class _Handler(FileSystemEventHandler):
         def _is_relevant(self, path: str) -> bool:
-            p = Path(path)
-            if p.suffix.lower() not in extensions:
-                return False
-            try:
-                rel = p.relative_to(project_path)
-            except ValueError:
-                return False
-            parts = rel.parts
-            ignore = set(config.ignore_patterns)
-            return not any(part in ignore for part in parts)
+            return is_relevant(path)
 
         def on_created(self, event):
             if not event.is_directory and self._is_relevant(event.src_path):
@@ -87,6 +112,15 @@ def watch_project(
             if not event.is_directory and self._is_relevant(event.src_path):
                 _schedule_reindex()
 
+        def on_moved(self, event):
+            # Editors often save by writing a temp file and renaming it over the target
+            if event.is_directory:
+                return
+            if self._is_relevant(event.src_path) or self._is_relevant(event.dest_path):
+                _schedule_reindex()
+
+    worker = threading.Thread(target=_worker, name="memboot-reindex", daemon=True)
+    worker.start()
     observer = Observer()
     observer.schedule(_Handler(), str(project_path), recursive=True)
     observer.start()
@@ -99,6 +133,6 @@ def watch_project(
     finally:
         observer.stop()
         observer.join()
-        with lock:
-            if timer is not None:
-                timer.cancel()
+        with wake:
+            stopped = True
+            wake.notify()
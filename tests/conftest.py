@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 
+from memboot.licensing import _compute_check_segment
 from memboot.models import Chunk, ChunkType, MembootConfig, Memory, MemoryType
 
+# A valid Pro license key, computed once per test session
+_PRO_KEY = f"MMBT-TEST-ABCD-{_compute_check_segment('TEST-ABCD')}"
+
 
 @pytest.fixture
 def sample_config() -> MembootConfig:
@@ -16,16 +22,34 @@ def sample_config() -> MembootConfig:
     return MembootConfig()
 
 
+@pytest.fixture
+def pro_license(monkeypatch: pytest.MonkeyPatch) -> str:
+    """Activate a valid Pro license through the environment."""
+    monkeypatch.setenv("MEMBOOT_LICENSE", _PRO_KEY)
+    return _PRO_KEY
+
+
+@pytest.fixture
+def free_tier(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure no license key is found in the environment or on disk."""
+    monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
+    monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
+
+
 @pytest.fixture
 def tmp_db_path(tmp_path: Path) -> Path:
     """Temp SQLite database path."""
     return tmp_path / "test.db"
 
 
-@pytest.fixture
-def tmp_project_dir(tmp_path: Path) -> Path:
-    """Temp project directory with sample files."""
-    project = tmp_path / "project"
+@pytest.fixture(scope="session")
+def ro_project(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Shared project path for tests that never write to it."""
+    return tmp_path_factory.mktemp("ro_proj")
+
+
+def _write_sample_project(project: Path) -> Path:
+    """Create a project directory with one sample file per supported format."""
     project.mkdir()
 
     # Sample Python file
@@ -51,6 +75,43 @@ def tmp_project_dir(tmp_path: Path) -> Path:
     return project
 
 
+@pytest.fixture
+def tmp_project_dir(tmp_path: Path) -> Path:
+    """Temp project directory with sample files."""
+    return _write_sample_project(tmp_path / "project")
+
+
+@pytest.fixture(scope="session")
+def _indexed_template(tmp_path_factory: pytest.TempPathFactory) -> tuple[Path, Path]:
+    """The sample project indexed once per session, as (project, db_path)."""
+    from memboot.indexer import index_project
+
+    base = tmp_path_factory.mktemp("indexed_template")
+    project = _write_sample_project(base / "project")
+    db_path = base / "index.db"
+    with patch("memboot.indexer.get_db_path", lambda p: db_path):
+        index_project(project)
+    return project, db_path
+
+
+@pytest.fixture
+def pre_indexed_project(
+    _indexed_template: tuple[Path, Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """A private copy of the indexed sample project, with its index in a temp home.
+
+    File mtimes are preserved by the copy, so the stored metadata still matches.
+    """
+    from memboot.indexer import get_db_path
+
+    db_dir = tmp_path / ".memboot"
+    monkeypatch.setenv("MEMBOOT_HOME", str(db_dir))
+    template_project, template_db = _indexed_template
+    project = Path(shutil.copytree(template_project, tmp_path / "project"))
+    shutil.copy(template_db, get_db_path(project))
+    return project
+
+
 @pytest.fixture
 def sample_chunk() -> Chunk:
     """Pre-built Chunk instance."""
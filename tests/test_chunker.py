@@ -12,14 +12,24 @@ from memboot.chunker import (
     _chunk_markdown,
     _chunk_python,
     _chunk_window,
+    _chunk_window_stream,
     _chunk_yaml,
+    _line_at,
+    _newline_offsets,
     chunk_file,
 )
 from memboot.exceptions import ChunkError
 from memboot.models import ChunkType, MembootConfig
 
+# A class large enough to trigger method splitting
+_BIG_CLASS_CODE = "class Big:\n" + "\n".join(
+    f"    def method_{i}(self):\n" + "        pass\n" * 50 for i in range(20)
+)
+_HELLO_BLOCK = "Hello world. " * 100
+_WORD_BLOCK = "word " * 200
+
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config() -> MembootConfig:
     return MembootConfig()
 
@@ -32,31 +42,23 @@ class TestChunkFile:
         assert len(chunks) >= 1
         assert any(c.chunk_type == ChunkType.FUNCTION for c in chunks)
 
-    def test_dispatch_markdown(self, tmp_path: Path, config: MembootConfig):
-        f = tmp_path / "test.md"
-        f.write_text("# Header\n\nContent here.\n")
-        chunks = chunk_file(f, config)
+    def test_markdown_sections(self, config: MembootConfig):
+        chunks = _chunk_markdown("# Header\n\nContent here.\n", config)
         assert len(chunks) >= 1
         assert any(c.chunk_type == ChunkType.MARKDOWN_SECTION for c in chunks)
 
-    def test_dispatch_yaml(self, tmp_path: Path, config: MembootConfig):
-        f = tmp_path / "test.yaml"
-        f.write_text("key1: value1\nkey2: value2\n")
-        chunks = chunk_file(f, config)
+    def test_yaml_keys(self, config: MembootConfig):
+        chunks = _chunk_yaml("key1: value1\nkey2: value2\n", config)
         assert len(chunks) >= 1
         assert any(c.chunk_type == ChunkType.YAML_KEY for c in chunks)
 
-    def test_dispatch_json(self, tmp_path: Path, config: MembootConfig):
-        f = tmp_path / "test.json"
-        f.write_text('{"key": "value"}\n')
-        chunks = chunk_file(f, config)
+    def test_json_keys(self, config: MembootConfig):
+        chunks = _chunk_json('{"key": "value"}\n', config)
         assert len(chunks) >= 1
         assert any(c.chunk_type == ChunkType.JSON_KEY for c in chunks)
 
-    def test_dispatch_txt_window(self, tmp_path: Path, config: MembootConfig):
-        f = tmp_path / "test.txt"
-        f.write_text("Some text content.\n")
-        chunks = chunk_file(f, config)
+    def test_txt_window(self, config: MembootConfig):
+        chunks = _chunk_window("Some text content.\n", config)
         assert len(chunks) >= 1
         assert any(c.chunk_type == ChunkType.WINDOW for c in chunks)
 
@@ -66,11 +68,8 @@ class TestChunkFile:
         chunks = chunk_file(f, config)
         assert chunks == []
 
-    def test_whitespace_only_file(self, tmp_path: Path, config: MembootConfig):
-        f = tmp_path / "blank.py"
-        f.write_text("   \n\n  \n")
-        chunks = chunk_file(f, config)
-        assert chunks == []
+    def test_whitespace_only(self, config: MembootConfig):
+        assert _chunk_python("   \n\n  \n", config) == []
 
     def test_unreadable_file(self, tmp_path: Path, config: MembootConfig):
         f = tmp_path / "nope.py"
@@ -96,12 +95,7 @@ class TestChunkPython:
         assert class_chunks[0].metadata["name"] == "Foo"
 
     def test_class_method_splitting(self, config: MembootConfig):
-        # Create a class large enough to trigger method splitting
-        methods = []
-        for i in range(20):
-            methods.append(f"    def method_{i}(self):\n" + "        pass\n" * 50)
-        code = "class Big:\n" + "\n".join(methods)
-        chunks = _chunk_python(code, config)
+        chunks = _chunk_python(_BIG_CLASS_CODE, config)
         method_chunks = [c for c in chunks if c.chunk_type == ChunkType.METHOD]
         assert len(method_chunks) > 0
 
@@ -156,6 +150,12 @@ class TestChunkMarkdown:
         chunks = _chunk_markdown(md, config)
         assert chunks[0].metadata["header"] == "My Title"
 
+    def test_empty_header_does_not_span_lines(self, config: MembootConfig):
+        md = "# Title\n\nIntro.\n#\n# Next\n\nBody.\n"
+        chunks = _chunk_markdown(md, config)
+        assert [c.metadata["header"] for c in chunks] == ["Title", "Next"]
+        assert chunks[1].start_line == 5
+
 
 class TestChunkYaml:
     def test_top_level_keys(self, config: MembootConfig):
@@ -210,15 +210,14 @@ class TestChunkJson:
 
 class TestChunkWindow:
     def test_basic_chunking(self, config: MembootConfig):
-        text = "Hello world. " * 100
-        chunks = _chunk_window(text, config)
+        chunks = _chunk_window(_HELLO_BLOCK, config)
         assert len(chunks) >= 1
         assert all(c.chunk_type == ChunkType.WINDOW for c in chunks)
 
     def test_overlap(self):
         config = MembootConfig(max_chunk_tokens=25, overlap_tokens=5)
-        text = "word " * 200  # ~1000 chars, chunks of ~100 chars with 20 char overlap
-        chunks = _chunk_window(text, config)
+        # ~1000 chars, chunks of ~100 chars with 20 char overlap
+        chunks = _chunk_window(_WORD_BLOCK, config)
         assert len(chunks) > 1
 
     def test_single_chunk_small_text(self, config: MembootConfig):
@@ -232,6 +231,35 @@ class TestChunkWindow:
         assert chunks[0].start_line >= 1
 
 
+class TestChunkWindowStream:
+    @pytest.mark.parametrize("piece_size", [1, 7, 100, 10_000])
+    def test_matches_joined_text(self, piece_size: int):
+        config = MembootConfig(max_chunk_tokens=25, overlap_tokens=5)
+        text = "".join(f"line {i} with some words\n\n" if i % 3 else f"x{i}" for i in range(300))
+        pieces = [text[i : i + piece_size] for i in range(0, len(text), piece_size)]
+        assert list(_chunk_window_stream(pieces, config)) == _chunk_window(text, config)
+
+    def test_empty_input(self, config: MembootConfig):
+        assert list(_chunk_window_stream([], config)) == []
+        assert list(_chunk_window_stream(["", "  "], config)) == []
+
+
+class TestLineAt:
+    def test_matches_prefix_count(self):
+        text = "a\nbb\n\nccc\n"
+        newlines = _newline_offsets(text)
+        assert newlines.tolist() == [1, 4, 5, 9]
+        for offset in range(len(text) + 1):
+            assert _line_at(newlines, offset) == text[:offset].count("\n") + 1
+
+    def test_offsets_count_characters_not_bytes(self):
+        text = "héllo\nwörld\n"
+        assert _newline_offsets(text).tolist() == [5, 11]
+
+    def test_no_newlines(self):
+        assert _line_at(_newline_offsets("single line"), 5) == 1
+
+
 class TestChunkResult:
     def test_slots(self):
         cr = ChunkResult(
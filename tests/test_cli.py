@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from typing import Any
+from unittest.mock import MagicMock
 
+import pytest
+from pytest_mock import MockerFixture
 from typer.testing import CliRunner
 
 from memboot import __version__
 from memboot.cli import app
-from memboot.exceptions import IndexingError, MembootError, QueryError
+from memboot.exceptions import IndexingError, IngestError, MembootError, QueryError
 from memboot.models import Memory, MemoryType, ProjectInfo, SearchResult
 
 runner = CliRunner()
@@ -21,6 +26,21 @@ class TestMain:
         assert result.exit_code == 0
         assert __version__ in result.output
 
+    def test_version_does_not_import_rich(self):
+        code = (
+            "import sys\n"
+            "from memboot.cli import app\n"
+            "try:\n"
+            "    app(['--version'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('rich.console' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.splitlines() == [f"memboot {__version__}", "False"]
+
     def test_no_command_shows_help(self):
         result = runner.invoke(app, [])
         assert result.exit_code == 0
@@ -28,26 +48,19 @@ class TestMain:
 
 
 class TestStatus:
-    def test_shows_tier(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
+    @pytest.mark.usefixtures("free_tier")
+    def test_shows_tier(self):
         result = runner.invoke(app, ["status"])
         assert result.exit_code == 0
         assert "Free" in result.output
 
-    def test_shows_features(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
+    @pytest.mark.usefixtures("free_tier")
+    def test_shows_features(self):
         result = runner.invoke(app, ["status"])
         assert "init" in result.output
 
-    def test_pro_with_key(self, monkeypatch):
-        from memboot.licensing import _compute_check_segment
-
-        body = "TEST-ABCD"
-        check = _compute_check_segment(body)
-        key = f"MMBT-{body}-{check}"
-        monkeypatch.setenv("MEMBOOT_LICENSE", key)
+    @pytest.mark.usefixtures("pro_license")
+    def test_pro_with_key(self):
         result = runner.invoke(app, ["status"])
         assert result.exit_code == 0
         assert "Pro" in result.output
@@ -61,7 +74,7 @@ class TestStatus:
 
 
 class TestInit:
-    def test_success(self, tmp_path: Path):
+    def test_success(self, tmp_path: Path, mocker: MockerFixture):
         project = tmp_path / "proj"
         project.mkdir()
         (project / "test.py").write_text("x = 1\n")
@@ -74,20 +87,20 @@ class TestInit:
             embedding_dim=512,
             embedding_backend="tfidf",
         )
-        with patch("memboot.indexer.index_project", return_value=info):
-            result = runner.invoke(app, ["init", str(project)])
-            assert result.exit_code == 0
-            assert "5 chunks" in result.output
+        mocker.patch("memboot.indexer.index_project", return_value=info)
+        result = runner.invoke(app, ["init", str(project)])
+        assert result.exit_code == 0
+        assert "5 chunks" in result.output
 
-    def test_error(self, tmp_path: Path):
-        with patch("memboot.indexer.index_project", side_effect=IndexingError("bad dir")):
-            result = runner.invoke(app, ["init", str(tmp_path)])
-            assert result.exit_code == 1
-            assert "bad dir" in result.output
+    def test_error(self, tmp_path: Path, mocker: MockerFixture):
+        mocker.patch("memboot.indexer.index_project", side_effect=IndexingError("bad dir"))
+        result = runner.invoke(app, ["init", str(tmp_path)])
+        assert result.exit_code == 1
+        assert "bad dir" in result.output
 
 
 class TestQuery:
-    def test_table_output(self, tmp_path: Path):
+    def test_table_output(self, ro_project: Path, mocker: MockerFixture):
         results = [
             SearchResult(
                 content="def hello(): pass",
@@ -95,31 +108,31 @@ class TestQuery:
                 score=0.95,
             )
         ]
-        with patch("memboot.query.search", return_value=results):
-            result = runner.invoke(app, ["query", "hello", "--project", str(tmp_path)])
-            assert result.exit_code == 0
-            assert "main.py" in result.output
+        mocker.patch("memboot.query.search", return_value=results)
+        result = runner.invoke(app, ["query", "hello", "--project", str(ro_project)])
+        assert result.exit_code == 0
+        assert "main.py" in result.output
 
-    def test_json_output(self, tmp_path: Path):
+    def test_json_output(self, ro_project: Path, mocker: MockerFixture):
         results = [SearchResult(content="test", source="f.py", score=0.8)]
-        with patch("memboot.query.search", return_value=results):
-            result = runner.invoke(app, ["query", "test", "--project", str(tmp_path), "--json"])
-            assert result.exit_code == 0
-            assert "f.py" in result.output
-
-    def test_no_results(self, tmp_path: Path):
-        with patch("memboot.query.search", return_value=[]):
-            result = runner.invoke(app, ["query", "nothing", "--project", str(tmp_path)])
-            assert result.exit_code == 0
-            assert "No results" in result.output
-
-    def test_error(self, tmp_path: Path):
-        with patch("memboot.query.search", side_effect=QueryError("no index")):
-            result = runner.invoke(app, ["query", "test", "--project", str(tmp_path)])
-            assert result.exit_code == 1
-            assert "no index" in result.output
-
-    def test_with_start_line(self, tmp_path: Path):
+        mocker.patch("memboot.query.search", return_value=results)
+        result = runner.invoke(app, ["query", "test", "--project", str(ro_project), "--json"])
+        assert result.exit_code == 0
+        assert "f.py" in result.output
+
+    def test_no_results(self, ro_project: Path, mocker: MockerFixture):
+        mocker.patch("memboot.query.search", return_value=[])
+        result = runner.invoke(app, ["query", "nothing", "--project", str(ro_project)])
+        assert result.exit_code == 0
+        assert "No results" in result.output
+
+    def test_error(self, ro_project: Path, mocker: MockerFixture):
+        mocker.patch("memboot.query.search", side_effect=QueryError("no index"))
+        result = runner.invoke(app, ["query", "test", "--project", str(ro_project)])
+        assert result.exit_code == 1
+        assert "no index" in result.output
+
+    def test_with_start_line(self, ro_project: Path, mocker: MockerFixture):
         results = [
             SearchResult(
                 content="def hello(): pass",
@@ -128,12 +141,12 @@ class TestQuery:
                 start_line=10,
             )
         ]
-        with patch("memboot.query.search", return_value=results):
-            result = runner.invoke(app, ["query", "hello", "--project", str(tmp_path)])
-            assert result.exit_code == 0
-            assert "main.py:10" in result.output
+        mocker.patch("memboot.query.search", return_value=results)
+        result = runner.invoke(app, ["query", "hello", "--project", str(ro_project)])
+        assert result.exit_code == 0
+        assert "main.py:10" in result.output
 
-    def test_long_content_truncated(self, tmp_path: Path):
+    def test_long_content_truncated(self, ro_project: Path, mocker: MockerFixture):
         results = [
             SearchResult(
                 content="x" * 200,
@@ -141,174 +154,162 @@ class TestQuery:
                 score=0.95,
             )
         ]
-        with patch("memboot.query.search", return_value=results):
-            result = runner.invoke(app, ["query", "x", "--project", str(tmp_path)])
-            assert result.exit_code == 0
-            # Rich table may use unicode ellipsis (…) or ASCII (...)
-            assert "..." in result.output or "…" in result.output
+        mocker.patch("memboot.query.search", return_value=results)
+        result = runner.invoke(app, ["query", "x", "--project", str(ro_project)])
+        assert result.exit_code == 0
+        # Rich table may use unicode ellipsis (…) or ASCII (...)
+        assert "..." in result.output or "…" in result.output
 
 
 class TestRemember:
-    def test_success(self, tmp_path: Path):
+    def test_success(self, ro_project: Path, mocker: MockerFixture):
         mem = Memory(
             id="m1",
             content="Test note content",
             memory_type=MemoryType.NOTE,
         )
-        with patch("memboot.memory.remember", return_value=mem):
-            result = runner.invoke(
-                app, ["remember", "Test note content", "--project", str(tmp_path)]
-            )
-            assert result.exit_code == 0
-            assert "Remembered" in result.output
+        mocker.patch("memboot.memory.remember", return_value=mem)
+        result = runner.invoke(app, ["remember", "Test note content", "--project", str(ro_project)])
+        assert result.exit_code == 0
+        assert "Remembered" in result.output
 
-    def test_invalid_type(self, tmp_path: Path):
+    def test_invalid_type(self, ro_project: Path):
         result = runner.invoke(
-            app, ["remember", "note", "--type", "invalid_type", "--project", str(tmp_path)]
+            app, ["remember", "note", "--type", "invalid_type", "--project", str(ro_project)]
         )
         assert result.exit_code == 1
         assert "Unknown memory type" in result.output
 
-    def test_error(self, tmp_path: Path):
-        with patch("memboot.memory.remember", side_effect=MembootError("fail")):
-            result = runner.invoke(app, ["remember", "note", "--project", str(tmp_path)])
-            assert result.exit_code == 1
+    def test_error(self, ro_project: Path, mocker: MockerFixture):
+        mocker.patch("memboot.memory.remember", side_effect=MembootError("fail"))
+        result = runner.invoke(app, ["remember", "note", "--project", str(ro_project)])
+        assert result.exit_code == 1
 
 
 class TestContext:
-    def test_success(self, tmp_path: Path):
-        with patch("memboot.context.build_context", return_value="## Context\nSome context here."):
-            result = runner.invoke(app, ["context", "test query", "--project", str(tmp_path)])
-            assert result.exit_code == 0
-            assert "Context" in result.output
+    def test_success(self, ro_project: Path, mocker: MockerFixture):
+        mocker.patch("memboot.context.build_context", return_value="## Context\nSome context here.")
+        result = runner.invoke(app, ["context", "test query", "--project", str(ro_project)])
+        assert result.exit_code == 0
+        assert "Context" in result.output
 
-    def test_error(self, tmp_path: Path):
-        with patch("memboot.context.build_context", side_effect=MembootError("fail")):
-            result = runner.invoke(app, ["context", "test", "--project", str(tmp_path)])
-            assert result.exit_code == 1
+    def test_error(self, ro_project: Path, mocker: MockerFixture):
+        mocker.patch("memboot.context.build_context", side_effect=MembootError("fail"))
+        result = runner.invoke(app, ["context", "test", "--project", str(ro_project)])
+        assert result.exit_code == 1
 
 
 class TestReset:
-    def test_with_yes_flag(self, tmp_path: Path):
+    def test_with_yes_flag(self, tmp_path: Path, mocker: MockerFixture):
         mock_store = MagicMock()
         db_path = tmp_path / "test.db"
         db_path.touch()
-        with (
-            patch("memboot.indexer.get_db_path", return_value=db_path),
-            patch("memboot.store.MembootStore", return_value=mock_store),
-        ):
-            result = runner.invoke(app, ["reset", "--project", str(tmp_path), "--yes"])
-            assert result.exit_code == 0
-            assert "reset" in result.output.lower()
-            mock_store.reset.assert_called_once()
-
-    def test_no_index(self, tmp_path: Path):
+        mocker.patch("memboot.indexer.get_db_path", return_value=db_path)
+        mocker.patch("memboot.store.MembootStore", return_value=mock_store)
+        result = runner.invoke(app, ["reset", "--project", str(tmp_path), "--yes"])
+        assert result.exit_code == 0
+        assert "reset" in result.output.lower()
+        mock_store.reset.assert_called_once()
+
+    def test_no_index(self, tmp_path: Path, mocker: MockerFixture):
         db_path = tmp_path / "nonexistent.db"
-        with patch("memboot.indexer.get_db_path", return_value=db_path):
-            result = runner.invoke(app, ["reset", "--project", str(tmp_path), "--yes"])
-            assert result.exit_code == 0
-            assert "No index" in result.output
+        mocker.patch("memboot.indexer.get_db_path", return_value=db_path)
+        result = runner.invoke(app, ["reset", "--project", str(tmp_path), "--yes"])
+        assert result.exit_code == 0
+        assert "No index" in result.output
 
-    def test_abort(self, tmp_path: Path):
+    def test_abort(self, tmp_path: Path, mocker: MockerFixture):
         db_path = tmp_path / "test.db"
         db_path.touch()
-        with patch("memboot.indexer.get_db_path", return_value=db_path):
-            result = runner.invoke(app, ["reset", "--project", str(tmp_path)], input="n\n")
-            assert result.exit_code != 0
+        mocker.patch("memboot.indexer.get_db_path", return_value=db_path)
+        result = runner.invoke(app, ["reset", "--project", str(tmp_path)], input="n\n")
+        assert result.exit_code != 0
 
 
 class TestIngest:
-    def test_file_success(self, tmp_path: Path):
+    def test_file_success(self, tmp_path: Path, mocker: MockerFixture):
         f = tmp_path / "data.txt"
         f.write_text("some data\n")
-        with patch("memboot.ingest.files.ingest_file", return_value=[MagicMock()] * 3):
-            result = runner.invoke(app, ["ingest", str(f), "--project", str(tmp_path)])
-            assert result.exit_code == 0
-            assert "3 chunks" in result.output
-
-    def test_file_error(self, tmp_path: Path):
-        from memboot.exceptions import IngestError
-
-        with patch("memboot.ingest.files.ingest_file", side_effect=IngestError("bad")):
-            result = runner.invoke(
-                app, ["ingest", str(tmp_path / "f.py"), "--project", str(tmp_path)]
-            )
-            assert result.exit_code == 1
+        mocker.patch("memboot.ingest.files.ingest_file", return_value=[MagicMock()] * 3)
+        result = runner.invoke(app, ["ingest", str(f), "--project", str(tmp_path)])
+        assert result.exit_code == 0
+        assert "3 chunks" in result.output
 
-    def test_url_gated(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
-        result = runner.invoke(app, ["ingest", "https://example.com"])
+    def test_file_error(self, tmp_path: Path, mocker: MockerFixture):
+        mocker.patch("memboot.ingest.files.ingest_file", side_effect=IngestError("bad"))
+        result = runner.invoke(app, ["ingest", str(tmp_path / "f.py"), "--project", str(tmp_path)])
         assert result.exit_code == 1
 
-    def test_url_success_with_pro(self, tmp_path: Path, monkeypatch):
-        from memboot.licensing import _compute_check_segment
-
-        body = "TEST-ABCD"
-        check = _compute_check_segment(body)
-        monkeypatch.setenv("MEMBOOT_LICENSE", f"MMBT-{body}-{check}")
-        with patch("memboot.ingest.web.ingest_url", return_value=[MagicMock()] * 2):
-            result = runner.invoke(
-                app, ["ingest", "https://example.com", "--project", str(tmp_path)]
-            )
-            assert result.exit_code == 0
-            assert "2 chunks" in result.output
-
-    def test_url_error_with_pro(self, tmp_path: Path, monkeypatch):
-        from memboot.exceptions import IngestError
-        from memboot.licensing import _compute_check_segment
-
-        body = "TEST-ABCD"
-        check = _compute_check_segment(body)
-        monkeypatch.setenv("MEMBOOT_LICENSE", f"MMBT-{body}-{check}")
-        with patch("memboot.ingest.web.ingest_url", side_effect=IngestError("fail")):
-            result = runner.invoke(
-                app, ["ingest", "https://example.com", "--project", str(tmp_path)]
-            )
-            assert result.exit_code == 1
-
-    def test_pdf_gated(self, monkeypatch, tmp_path: Path):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
-        result = runner.invoke(app, ["ingest", "doc.pdf", "--project", str(tmp_path)])
-        assert result.exit_code == 1
 
-    def test_pdf_success_with_pro(self, tmp_path: Path, monkeypatch):
-        from memboot.licensing import _compute_check_segment
-
-        body = "TEST-ABCD"
-        check = _compute_check_segment(body)
-        monkeypatch.setenv("MEMBOOT_LICENSE", f"MMBT-{body}-{check}")
-        with patch("memboot.ingest.pdf.ingest_pdf", return_value=[MagicMock()] * 4):
-            result = runner.invoke(app, ["ingest", "doc.pdf", "--project", str(tmp_path)])
-            assert result.exit_code == 0
-            assert "4 chunks" in result.output
-
-    def test_pdf_error_with_pro(self, tmp_path: Path, monkeypatch):
-        from memboot.exceptions import IngestError
-        from memboot.licensing import _compute_check_segment
-
-        body = "TEST-ABCD"
-        check = _compute_check_segment(body)
-        monkeypatch.setenv("MEMBOOT_LICENSE", f"MMBT-{body}-{check}")
-        with patch("memboot.ingest.pdf.ingest_pdf", side_effect=IngestError("fail")):
-            result = runner.invoke(app, ["ingest", "doc.pdf", "--project", str(tmp_path)])
-            assert result.exit_code == 1
-
-
-class TestServe:
-    def test_gated(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
-        result = runner.invoke(app, ["serve"])
+class TestProCommands:
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["ingest", "https://example.com"],
+            ["ingest", "doc.pdf", "--project", "{tmp}"],
+            ["serve"],
+        ],
+        ids=["url", "pdf", "serve"],
+    )
+    @pytest.mark.usefixtures("free_tier")
+    def test_gated(self, argv: list[str], ro_project: Path):
+        result = runner.invoke(app, [arg.format(tmp=ro_project) for arg in argv])
         assert result.exit_code == 1
 
-    def test_serve_error_with_pro(self, monkeypatch):
-        from memboot.licensing import _compute_check_segment
-
-        body = "TEST-ABCD"
-        check = _compute_check_segment(body)
-        monkeypatch.setenv("MEMBOOT_LICENSE", f"MMBT-{body}-{check}")
-        with patch("memboot.mcp_server.run_server", side_effect=MembootError("no mcp")):
-            result = runner.invoke(app, ["serve"])
-            assert result.exit_code == 1
+    @pytest.mark.usefixtures("pro_license")
+    @pytest.mark.parametrize(
+        ("target", "mock_kwargs", "argv", "exit_code", "expected"),
+        [
+            (
+                "memboot.ingest.web.ingest_url",
+                {"return_value": [MagicMock()] * 2},
+                ["ingest", "https://example.com", "--project", "{tmp}"],
+                0,
+                "2 chunks",
+            ),
+            (
+                "memboot.ingest.web.ingest_url",
+                {"side_effect": IngestError("fail")},
+                ["ingest", "https://example.com", "--project", "{tmp}"],
+                1,
+                None,
+            ),
+            (
+                "memboot.ingest.pdf.ingest_pdf",
+                {"return_value": [MagicMock()] * 4},
+                ["ingest", "doc.pdf", "--project", "{tmp}"],
+                0,
+                "4 chunks",
+            ),
+            (
+                "memboot.ingest.pdf.ingest_pdf",
+                {"side_effect": IngestError("fail")},
+                ["ingest", "doc.pdf", "--project", "{tmp}"],
+                1,
+                None,
+            ),
+            (
+                "memboot.mcp_server.run_server",
+                {"side_effect": MembootError("no mcp")},
+                ["serve"],
+                1,
+                None,
+            ),
+        ],
+        ids=["url-success", "url-error", "pdf-success", "pdf-error", "serve-error"],
+    )
+    def test_with_pro(
+        self,
+        target: str,
+        mock_kwargs: dict[str, Any],
+        argv: list[str],
+        exit_code: int,
+        expected: str | None,
+        ro_project: Path,
+        mocker: MockerFixture,
+    ):
+        mocker.patch(target, **mock_kwargs)
+        result = runner.invoke(app, [arg.format(tmp=ro_project) for arg in argv])
+        assert result.exit_code == exit_code
+        if expected is not None:
+            assert expected in result.output
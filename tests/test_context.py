@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 from pathlib import Path
-from unittest.mock import patch
+
+from pytest_mock import MockerFixture
 
 from memboot.context import build_context
 from memboot.models import ChunkType, SearchResult
 
+_X500 = "x" * 500
+
 
 def _make_result(
     content: str = "def foo(): pass",
@@ -28,15 +31,15 @@ def _make_result(
 
 
 class TestBuildContext:
-    def test_with_code_results(self, tmp_path: Path):
+    def test_with_code_results(self, ro_project: Path, mocker: MockerFixture):
         results = [_make_result()]
-        with patch("memboot.context.search", return_value=results):
-            ctx = build_context("test", tmp_path)
-            assert "src/foo.py:1-5" in ctx
-            assert "function" in ctx
-            assert "def foo(): pass" in ctx
+        mocker.patch("memboot.context.search", return_value=results)
+        ctx = build_context("test", ro_project)
+        assert "src/foo.py:1-5" in ctx
+        assert "function" in ctx
+        assert "def foo(): pass" in ctx
 
-    def test_with_memory_results(self, tmp_path: Path):
+    def test_with_memory_results(self, ro_project: Path, mocker: MockerFixture):
         results = [
             SearchResult(
                 content="Always use fixtures.",
@@ -44,47 +47,53 @@ class TestBuildContext:
                 score=0.85,
             )
         ]
-        with patch("memboot.context.search", return_value=results):
-            ctx = build_context("test", tmp_path)
-            assert "Memory" in ctx
-            assert "Always use fixtures." in ctx
+        mocker.patch("memboot.context.search", return_value=results)
+        ctx = build_context("test", ro_project)
+        assert "Memory" in ctx
+        assert "Always use fixtures." in ctx
 
-    def test_no_results(self, tmp_path: Path):
-        with patch("memboot.context.search", return_value=[]):
-            ctx = build_context("test", tmp_path)
-            assert "No relevant context found" in ctx
+    def test_no_results(self, ro_project: Path, mocker: MockerFixture):
+        mocker.patch("memboot.context.search", return_value=[])
+        ctx = build_context("test", ro_project)
+        assert "No relevant context found" in ctx
 
-    def test_token_budget(self, tmp_path: Path):
+    def test_token_budget(self, ro_project: Path, mocker: MockerFixture):
         # Create results that exceed the budget
         results = [
-            _make_result(content="x" * 500, source=f"f{i}.py", score=0.9 - i * 0.1)
-            for i in range(20)
+            _make_result(content=_X500, source=f"f{i}.py", score=0.9 - i * 0.1) for i in range(20)
         ]
-        with patch("memboot.context.search", return_value=results):
-            ctx = build_context("test", tmp_path, max_tokens=200)
-            # Should not include all 20 results
-            assert ctx.count("```") < 40  # Less than 20 code blocks
+        mocker.patch("memboot.context.search", return_value=results)
+        ctx = build_context("test", ro_project, max_tokens=200)
+        # Should not include all 20 results
+        assert ctx.count("```") < 40  # Less than 20 code blocks
+
+    def test_token_budget_includes_exact_fit(self, ro_project: Path, mocker: MockerFixture):
+        # Each entry costs 80 // 4 + 20 = 40 tokens
+        results = [_make_result(content="y" * 80, source=f"f{i}.py") for i in range(5)]
+        mocker.patch("memboot.context.search", return_value=results)
+        ctx = build_context("test", ro_project, max_tokens=80)
+        assert "2 results" in ctx
 
-    def test_line_attribution(self, tmp_path: Path):
+    def test_line_attribution(self, ro_project: Path, mocker: MockerFixture):
         results = [_make_result(start_line=10, end_line=20, source="main.py")]
-        with patch("memboot.context.search", return_value=results):
-            ctx = build_context("test", tmp_path)
-            assert "main.py:10-20" in ctx
+        mocker.patch("memboot.context.search", return_value=results)
+        ctx = build_context("test", ro_project)
+        assert "main.py:10-20" in ctx
 
-    def test_source_without_lines(self, tmp_path: Path):
+    def test_source_without_lines(self, ro_project: Path, mocker: MockerFixture):
         results = [_make_result(start_line=None, end_line=None, source="data.txt")]
-        with patch("memboot.context.search", return_value=results):
-            ctx = build_context("test", tmp_path)
-            assert "data.txt" in ctx
+        mocker.patch("memboot.context.search", return_value=results)
+        ctx = build_context("test", ro_project)
+        assert "data.txt" in ctx
 
-    def test_score_included(self, tmp_path: Path):
+    def test_score_included(self, ro_project: Path, mocker: MockerFixture):
         results = [_make_result(score=0.876)]
-        with patch("memboot.context.search", return_value=results):
-            ctx = build_context("test", tmp_path)
-            assert "0.876" in ctx
+        mocker.patch("memboot.context.search", return_value=results)
+        ctx = build_context("test", ro_project)
+        assert "0.876" in ctx
 
-    def test_results_count_in_header(self, tmp_path: Path):
+    def test_results_count_in_header(self, ro_project: Path, mocker: MockerFixture):
         results = [_make_result(source=f"f{i}.py") for i in range(3)]
-        with patch("memboot.context.search", return_value=results):
-            ctx = build_context("test", tmp_path)
-            assert "3 results" in ctx
+        mocker.patch("memboot.context.search", return_value=results)
+        ctx = build_context("test", ro_project)
+        assert "3 results" in ctx
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from unittest.mock import patch
 
 import numpy as np
@@ -10,12 +11,24 @@ import pytest
 from memboot.embedder import (
     BaseEmbedder,
     TfidfEmbedder,
+    _shared_embedder,
     _tokenize,
     get_embedder,
+    load_embedder,
+    load_tfidf_embedder,
+    restore_tfidf_embedder,
 )
 from memboot.exceptions import EmbedError
 
 
+@pytest.fixture(scope="module")
+def fitted_tfidf() -> TfidfEmbedder:
+    """A fitted embedder shared by tests that only read from it."""
+    emb = TfidfEmbedder(max_features=10)
+    emb.fit(["hello world", "foo bar baz", "hello foo"])
+    return emb
+
+
 class TestTokenize:
     def test_basic_words(self):
         tokens = _tokenize("hello world test")
@@ -43,6 +56,9 @@ class TestTokenize:
     def test_empty_string(self):
         assert _tokenize("") == []
 
+    def test_unicode_words(self):
+        assert _tokenize("Größe und Ärger x") == ["größe", "und", "ärger"]
+
 
 class TestTfidfEmbedder:
     def test_fit_and_embed(self):
@@ -53,16 +69,12 @@ class TestTfidfEmbedder:
         assert result.shape == (3, 10)
         assert result.dtype == np.float32
 
-    def test_embed_single(self):
-        emb = TfidfEmbedder(max_features=10)
-        emb.fit(["hello world", "foo bar"])
-        result = emb.embed_text("hello world")
+    def test_embed_single(self, fitted_tfidf: TfidfEmbedder):
+        result = fitted_tfidf.embed_text("hello world")
         assert result.shape == (10,)
 
-    def test_l2_normalized(self):
-        emb = TfidfEmbedder(max_features=10)
-        emb.fit(["hello world", "foo bar baz"])
-        result = emb.embed_texts(["hello world"])
+    def test_l2_normalized(self, fitted_tfidf: TfidfEmbedder):
+        result = fitted_tfidf.embed_texts(["hello world"])
         norm = np.linalg.norm(result[0])
         assert abs(norm - 1.0) < 1e-5 or norm == 0.0
 
@@ -76,16 +88,86 @@ class TestTfidfEmbedder:
         with pytest.raises(EmbedError, match="not fitted"):
             emb.embed_texts(["hello"])
 
-    def test_save_and_restore(self):
-        emb = TfidfEmbedder(max_features=10)
-        emb.fit(["hello world", "foo bar"])
-        state = emb.save_state()
+    def test_save_and_restore(self, fitted_tfidf: TfidfEmbedder):
+        state = fitted_tfidf.save_state()
 
         restored = TfidfEmbedder.from_state(state)
-        original = emb.embed_text("hello world")
+        original = fitted_tfidf.embed_text("hello world")
         restored_result = restored.embed_text("hello world")
         np.testing.assert_array_almost_equal(original, restored_result)
 
+    def test_state_bytes_roundtrip(self, fitted_tfidf: TfidfEmbedder):
+        restored = TfidfEmbedder.from_state_bytes(fitted_tfidf.save_state_bytes())
+        assert restored.dim == 10
+        assert restored.save_state() == fitted_tfidf.save_state()
+
+    def test_state_bytes_empty_vocabulary(self):
+        emb = TfidfEmbedder(max_features=4)
+        emb.fit(["a b c"])  # no tokens of length >= 2
+        restored = TfidfEmbedder.from_state_bytes(emb.save_state_bytes())
+        assert restored.save_state() == emb.save_state()
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"XXXX" + bytes(8),
+            b"TFv1\x04\0\0\0\x02\0\0\0",
+            b"TFv1\x04\0\0\0\x01\0\0\0" + bytes(3),  # IDF cut short
+            b"TFv1\x04\0\0\0\x01\0\0\0" + bytes(4) + b"\xff",  # terms not UTF-8
+        ],
+        ids=["empty", "bad-magic", "no-vocabulary", "truncated-idf", "bad-utf8"],
+    )
+    def test_corrupt_state_bytes(self, data: bytes):
+        with pytest.raises(EmbedError, match="Corrupt"):
+            TfidfEmbedder.from_state_bytes(data)
+
+    def test_load_from_store_prefers_binary(self, tmp_db_path):
+        from memboot.store import MembootStore
+
+        store = MembootStore(tmp_db_path)
+        assert load_tfidf_embedder(store) is None
+
+        legacy = TfidfEmbedder(max_features=10)
+        legacy.fit(["legacy words"])
+        store.set_meta("tfidf_state", json.dumps(legacy.save_state()))
+        loaded = load_tfidf_embedder(store)
+        assert loaded is not None
+        assert loaded.save_state() == legacy.save_state()
+
+        current = TfidfEmbedder(max_features=10)
+        current.fit(["binary words"])
+        store.set_meta_blob("tfidf_state_bin", current.save_state_bytes())
+        loaded = load_tfidf_embedder(store)
+        assert loaded is not None
+        assert loaded.save_state() == current.save_state()
+        store.close()
+
+    def test_restore_from_json_is_memoized(self):
+        emb = TfidfEmbedder(max_features=10)
+        emb.fit(["hello world", "foo bar"])
+        state_json = json.dumps(emb.save_state())
+
+        restored = restore_tfidf_embedder(state_json)
+        assert restore_tfidf_embedder(str(state_json)) is restored
+        np.testing.assert_array_almost_equal(
+            restored.embed_text("hello world"), emb.embed_text("hello world")
+        )
+
+    def test_fit_transform_matches_fit_then_embed(self):
+        corpus = ["hello world", "foo bar baz", "hello foo"]
+        separate = TfidfEmbedder(max_features=10)
+        separate.fit(corpus)
+        combined = TfidfEmbedder(max_features=10)
+        np.testing.assert_array_almost_equal(
+            combined.fit_transform(corpus), separate.embed_texts(corpus)
+        )
+        assert combined._vocabulary == separate._vocabulary
+
+    def test_fit_transform_empty_corpus_raises(self):
+        with pytest.raises(EmbedError, match="empty corpus"):
+            TfidfEmbedder().fit_transform([])
+
     def test_save_state_unfitted_raises(self):
         emb = TfidfEmbedder()
         with pytest.raises(EmbedError, match="not fitted"):
@@ -101,15 +183,45 @@ class TestTfidfEmbedder:
         result = emb.embed_texts(["hello world"])
         assert result.shape[1] == 100
 
-    def test_empty_text_embedding(self):
-        emb = TfidfEmbedder(max_features=10)
-        emb.fit(["hello world", "foo bar"])
-        result = emb.embed_texts([""])
+    def test_empty_text_embedding(self, fitted_tfidf: TfidfEmbedder):
+        result = fitted_tfidf.embed_texts([""])
         assert result.shape == (1, 10)
         # Empty text should give zero vector (normalized to zero)
         assert np.all(result[0] == 0.0) or np.linalg.norm(result[0]) > 0
 
 
+class TestLoadEmbedder:
+    def test_tfidf_state(self, tmp_db_path):
+        from memboot.store import MembootStore
+
+        store = MembootStore(tmp_db_path)
+        assert load_embedder(store) is None
+
+        emb = TfidfEmbedder(max_features=10)
+        emb.fit(["hello world"])
+        store.set_meta_blob("tfidf_state_bin", emb.save_state_bytes())
+        loaded = load_embedder(store)
+        assert isinstance(loaded, TfidfEmbedder)
+        assert load_embedder(store) is loaded
+        store.close()
+
+    def test_other_backend_is_shared(self, tmp_db_path):
+        from memboot.store import MembootStore
+
+        store = MembootStore(tmp_db_path)
+        store.set_meta("embedding_backend", "sentence-transformers")
+        _shared_embedder.cache_clear()
+        fake = TfidfEmbedder()
+        try:
+            with patch("memboot.embedder.get_embedder", return_value=fake) as factory:
+                assert load_embedder(store) is fake
+                assert load_embedder(store) is fake
+            factory.assert_called_once_with("sentence-transformers")
+        finally:
+            _shared_embedder.cache_clear()
+        store.close()
+
+
 class TestSentenceTransformerEmbedder:
     def test_import_error(self):
         with (
@@ -15,26 +15,29 @@ from memboot.exceptions import (
     StoreError,
 )
 
+_SUBCLASSES = (
+    ChunkError,
+    EmbedError,
+    StoreError,
+    IndexingError,
+    IngestError,
+    QueryError,
+    LicenseError,
+)
+
 
 class TestExceptionHierarchy:
     def test_memboot_error_is_exception(self):
         assert issubclass(MembootError, Exception)
 
-    @pytest.mark.parametrize(
-        "exc_class",
-        [ChunkError, EmbedError, StoreError, IndexingError, IngestError, QueryError, LicenseError],
-    )
-    def test_subclass_of_memboot_error(self, exc_class):
-        assert issubclass(exc_class, MembootError)
-
-    @pytest.mark.parametrize(
-        "exc_class",
-        [ChunkError, EmbedError, StoreError, IndexingError, IngestError, QueryError, LicenseError],
-    )
-    def test_message_preserved(self, exc_class):
+    def test_subclasses_of_memboot_error(self):
+        for exc_class in _SUBCLASSES:
+            assert issubclass(exc_class, MembootError), exc_class.__name__
+
+    def test_message_preserved(self):
         msg = "something went wrong"
-        exc = exc_class(msg)
-        assert str(exc) == msg
+        for exc_class in _SUBCLASSES:
+            assert str(exc_class(msg)) == msg, exc_class.__name__
 
     def test_raise_and_catch_as_memboot_error(self):
         with pytest.raises(MembootError):
@@ -0,0 +1,16 @@
+"""Tests for memboot.ids."""
+
+from __future__ import annotations
+
+from memboot.ids import new_ids
+
+
+class TestNewIds:
+    def test_unique_hex_ids(self):
+        ids = new_ids(100)
+        assert len(ids) == 100
+        assert len(set(ids)) == 100
+        assert all(len(i) == 32 and int(i, 16) >= 0 for i in ids)
+
+    def test_zero(self):
+        assert new_ids(0) == []
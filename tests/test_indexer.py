@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import os
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
 from memboot.exceptions import IndexingError
 from memboot.indexer import (
     _categorize_files,
+    _chunk_files,
+    _content_hashes,
     _should_ignore,
     compute_project_hash,
     discover_files,
@@ -21,6 +25,14 @@ from memboot.models import MembootConfig
 from memboot.store import MembootStore
 
 
+def _count_chunks(project: Path) -> int:
+    store = MembootStore(get_db_path(project))
+    try:
+        return store.count_chunks()
+    finally:
+        store.close()
+
+
 class TestComputeProjectHash:
     def test_deterministic(self, tmp_path: Path):
         h1 = compute_project_hash(tmp_path)
@@ -41,15 +53,21 @@ class TestComputeProjectHash:
 
 
 class TestGetDbPath:
-    def test_returns_path_in_memboot_home(self, tmp_path: Path):
-        with patch("memboot.indexer.Path.expanduser", return_value=tmp_path / ".memboot"):
-            db = get_db_path(tmp_path / "project")
-            assert ".memboot" in str(db.parent.name) or str(db).endswith(".db")
+    def test_returns_path_in_memboot_home(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("MEMBOOT_HOME", str(tmp_path / ".memboot"))
+        db = get_db_path(tmp_path / "project")
+        assert db.parent == tmp_path / ".memboot"
+        assert db.parent.is_dir()
 
-    def test_db_extension(self, tmp_path: Path):
-        with patch("memboot.indexer.Path.expanduser", return_value=tmp_path / ".memboot"):
-            db = get_db_path(tmp_path)
-            assert str(db).endswith(".db")
+    def test_db_extension(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("MEMBOOT_HOME", str(tmp_path / ".memboot"))
+        db = get_db_path(tmp_path)
+        assert str(db).endswith(".db")
+
+    def test_defaults_to_home_dot_memboot(self, tmp_path: Path, monkeypatch):
+        monkeypatch.delenv("MEMBOOT_HOME", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert get_db_path(tmp_path / "project").parent == tmp_path / ".memboot"
 
 
 class TestShouldIgnore:
@@ -65,6 +83,12 @@ class TestShouldIgnore:
     def test_glob_pattern(self):
         assert _should_ignore(Path("mypackage.egg-info/PKG-INFO"), ["*.egg-info"])
 
+    def test_no_patterns(self):
+        assert not _should_ignore(Path("src/main.py"), [])
+
+    def test_pattern_must_match_whole_name(self):
+        assert not _should_ignore(Path(".github/ci.yml"), [".git"])
+
 
 class TestDiscoverFiles:
     def test_finds_matching_extensions(self, tmp_project_dir: Path):
@@ -86,6 +110,24 @@ class TestDiscoverFiles:
         files = discover_files(project, config)
         assert all("__pycache__" not in str(f) for f in files)
 
+    def test_skips_nested_ignored_dirs(self, tmp_path: Path):
+        project = tmp_path / "proj"
+        (project / "src" / "node_modules" / "pkg").mkdir(parents=True)
+        (project / "src" / "main.py").write_text("x = 1\n")
+        (project / "src" / "node_modules" / "pkg" / "index.json").write_text("{}\n")
+
+        files = discover_files(project, MembootConfig())
+        assert files == [project / "src" / "main.py"]
+
+    def test_suffix_matching(self, tmp_path: Path):
+        project = tmp_path / "proj"
+        project.mkdir()
+        for name in ("UPPER.PY", "archive.tar.md", ".md", "Makefile", "notes.py.bak"):
+            (project / name).write_text("x\n")
+
+        files = discover_files(project, MembootConfig())
+        assert [f.name for f in files] == ["UPPER.PY", "archive.tar.md"]
+
     def test_sorted_output(self, tmp_project_dir: Path):
         config = MembootConfig()
         files = discover_files(tmp_project_dir, config)
@@ -103,10 +145,7 @@ class TestIndexProject:
     def test_full_pipeline(self, tmp_project_dir: Path, monkeypatch):
         # Redirect db storage to temp dir
         db_dir = tmp_project_dir.parent / ".memboot"
-        monkeypatch.setattr(
-            "memboot.indexer.Path.expanduser",
-            lambda self: db_dir if str(self) == "~/.memboot" else Path.home(),
-        )
+        monkeypatch.setenv("MEMBOOT_HOME", str(db_dir))
         info = index_project(tmp_project_dir)
         assert info.chunk_count > 0
         assert info.embedding_backend == "tfidf"
@@ -122,29 +161,20 @@ class TestIndexProject:
         project = tmp_path / "empty"
         project.mkdir()
         db_dir = tmp_path / ".memboot"
-        monkeypatch.setattr(
-            "memboot.indexer.Path.expanduser",
-            lambda self: db_dir if str(self) == "~/.memboot" else Path.home(),
-        )
+        monkeypatch.setenv("MEMBOOT_HOME", str(db_dir))
         info = index_project(project)
         assert info.chunk_count == 0
 
     def test_force_reindex(self, tmp_project_dir: Path, monkeypatch):
         db_dir = tmp_project_dir.parent / ".memboot"
-        monkeypatch.setattr(
-            "memboot.indexer.Path.expanduser",
-            lambda self: db_dir if str(self) == "~/.memboot" else Path.home(),
-        )
+        monkeypatch.setenv("MEMBOOT_HOME", str(db_dir))
         index_project(tmp_project_dir)
         info2 = index_project(tmp_project_dir, force=True)
         assert info2.chunk_count > 0
 
     def test_metadata_on_first_run(self, tmp_project_dir: Path, monkeypatch):
         db_dir = tmp_project_dir.parent / ".memboot"
-        monkeypatch.setattr(
-            "memboot.indexer.Path.expanduser",
-            lambda self: db_dir if str(self) == "~/.memboot" else Path.home(),
-        )
+        monkeypatch.setenv("MEMBOOT_HOME", str(db_dir))
         info = index_project(tmp_project_dir)
         assert info.metadata["new_files"] > 0
         assert info.metadata["changed_files"] == 0
@@ -152,6 +182,59 @@ class TestIndexProject:
         assert info.metadata["deleted_files"] == 0
         assert info.metadata["new_chunks"] == info.chunk_count
 
+    def test_chunks_share_batch_timestamp(self, tmp_project_dir: Path, monkeypatch):
+        db_dir = tmp_project_dir.parent / ".memboot"
+        monkeypatch.setenv("MEMBOOT_HOME", str(db_dir))
+        info = index_project(tmp_project_dir)
+        store = MembootStore(info.db_path)
+        stamps = {row[0] for row in store._get_conn().execute("SELECT created_at FROM chunks")}
+        store.close()
+        assert len(stamps) == 1
+
+
+class TestChunkFiles:
+    def test_parallel_matches_serial(self, tmp_project_dir: Path, monkeypatch):
+        config = MembootConfig()
+        files = discover_files(tmp_project_dir, config)
+        serial = _chunk_files(files, config)
+        monkeypatch.setattr("memboot.indexer._PARALLEL_CHUNK_MIN_FILES", 1)
+        monkeypatch.setattr("memboot.indexer.os.cpu_count", lambda: 2)
+        assert _chunk_files(files, config) == serial
+
+    def test_parallel_from_worker_thread(self, tmp_project_dir: Path, monkeypatch):
+        """The watcher indexes off the main thread; workers must not be forked there."""
+        config = MembootConfig()
+        files = discover_files(tmp_project_dir, config)
+        serial = _chunk_files(files, config)
+        monkeypatch.setattr("memboot.indexer._PARALLEL_CHUNK_MIN_FILES", 1)
+        monkeypatch.setattr("memboot.indexer.os.cpu_count", lambda: 2)
+
+        start_methods: list[str] = []
+
+        def recording_pool(*args, **kwargs):
+            start_methods.append(kwargs["mp_context"].get_start_method())
+            return ProcessPoolExecutor(*args, **kwargs)
+
+        monkeypatch.setattr("memboot.indexer.ProcessPoolExecutor", recording_pool)
+        results: list[list] = []
+        thread = threading.Thread(target=lambda: results.append(_chunk_files(files, config)))
+        thread.start()
+        thread.join(timeout=60)
+        assert results == [serial]
+        assert start_methods
+        assert "fork" not in start_methods
+
+
+class TestContentHashes:
+    def test_parallel_matches_serial(self, tmp_project_dir: Path, monkeypatch):
+        files = discover_files(tmp_project_dir, MembootConfig())
+        files.append(tmp_project_dir / "missing.py")
+        serial = _content_hashes(files)
+        assert serial[-1] is None
+        monkeypatch.setattr("memboot.indexer._PARALLEL_HASH_MIN_FILES", 1)
+        monkeypatch.setattr("memboot.indexer.os.cpu_count", lambda: 2)
+        assert _content_hashes(files) == serial
+
 
 class TestCategorizeFiles:
     def test_all_new(self, tmp_path: Path):
@@ -198,6 +281,19 @@ class TestCategorizeFiles:
         unchanged, changed, new, deleted = _categorize_files([f], project, stored)
         assert len(changed) == 1
 
+    def test_uses_precomputed_rel_and_stat(self, tmp_path: Path):
+        project = tmp_path / "proj"
+        project.mkdir()
+        f = project / "a.py"
+        f.write_text("x = 1\n")
+        stat = f.stat()
+        stored = {"renamed.py": (stat.st_mtime, stat.st_size, 3)}
+        unchanged, changed, new, deleted = _categorize_files(
+            [f], project, stored, rel_paths={f: "renamed.py"}, stats={f: stat}
+        )
+        assert unchanged == [f]
+        assert deleted == []
+
     def test_deleted(self, tmp_path: Path):
         project = tmp_path / "proj"
         project.mkdir()
@@ -234,53 +330,48 @@ class TestIncrementalReindex:
     def _db_dir(self, tmp_path, monkeypatch):
         """Redirect memboot DB storage to temp dir."""
         db_dir = tmp_path / ".memboot"
-        monkeypatch.setattr(
-            "memboot.indexer.Path.expanduser",
-            lambda self: db_dir if str(self) == "~/.memboot" else Path.home(),
-        )
+        monkeypatch.setenv("MEMBOOT_HOME", str(db_dir))
         return db_dir
 
-    def test_second_run_no_changes(self, tmp_project_dir: Path, _db_dir):
-        info1 = index_project(tmp_project_dir)
-        assert info1.chunk_count > 0
+    def test_second_run_no_changes(self, pre_indexed_project: Path):
+        chunk_count = _count_chunks(pre_indexed_project)
+        assert chunk_count > 0
 
-        info2 = index_project(tmp_project_dir)
-        assert info2.chunk_count == info1.chunk_count
+        info2 = index_project(pre_indexed_project)
+        assert info2.chunk_count == chunk_count
         assert info2.metadata["new_chunks"] == 0
         assert info2.metadata["unchanged_files"] > 0
         assert info2.metadata["changed_files"] == 0
 
-    def test_modified_file_reindexed(self, tmp_project_dir: Path, _db_dir):
-        index_project(tmp_project_dir)
-
+    def test_modified_file_reindexed(self, pre_indexed_project: Path):
         # Modify a file — ensure mtime changes
-        f = tmp_project_dir / "main.py"
+        f = pre_indexed_project / "main.py"
         time.sleep(0.05)
         f.write_text('def hello():\n    return "hi"\n\ndef extra():\n    return "more"\n')
 
-        info2 = index_project(tmp_project_dir)
+        info2 = index_project(pre_indexed_project)
         assert info2.metadata["changed_files"] == 1
         assert info2.metadata["new_chunks"] > 0
 
-    def test_new_file_indexed(self, tmp_project_dir: Path, _db_dir):
-        info1 = index_project(tmp_project_dir)
+    def test_new_file_indexed(self, pre_indexed_project: Path):
+        chunk_count = _count_chunks(pre_indexed_project)
 
         # Add a new file
-        (tmp_project_dir / "extra.py").write_text('def extra():\n    return "new"\n')
+        (pre_indexed_project / "extra.py").write_text('def extra():\n    return "new"\n')
 
-        info2 = index_project(tmp_project_dir)
+        info2 = index_project(pre_indexed_project)
         assert info2.metadata["new_files"] == 1
-        assert info2.chunk_count > info1.chunk_count
+        assert info2.chunk_count > chunk_count
 
-    def test_deleted_file_chunks_removed(self, tmp_project_dir: Path, _db_dir):
-        info1 = index_project(tmp_project_dir)
+    def test_deleted_file_chunks_removed(self, pre_indexed_project: Path):
+        chunk_count = _count_chunks(pre_indexed_project)
 
         # Delete a file
-        (tmp_project_dir / "notes.txt").unlink()
+        (pre_indexed_project / "notes.txt").unlink()
 
-        info2 = index_project(tmp_project_dir)
+        info2 = index_project(pre_indexed_project)
         assert info2.metadata["deleted_files"] == 1
-        assert info2.chunk_count < info1.chunk_count
+        assert info2.chunk_count < chunk_count
 
     def test_force_reindexes_everything(self, tmp_project_dir: Path, _db_dir):
         index_project(tmp_project_dir)
@@ -313,3 +404,53 @@ class TestIncrementalReindex:
         store.close()
         # After force, file_meta is repopulated for all files
         assert len(meta) > 0
+
+    def test_refit_replaces_legacy_json_state(self, tmp_project_dir: Path, _db_dir):
+        index_project(tmp_project_dir)
+        from memboot.indexer import get_db_path
+
+        store = MembootStore(get_db_path(tmp_project_dir))
+        store.set_meta("tfidf_state", "{}")
+        store.close()
+
+        index_project(tmp_project_dir, force=True)
+        store = MembootStore(get_db_path(tmp_project_dir))
+        assert store.get_meta("tfidf_state") is None
+        assert store.get_meta_blob("tfidf_state_bin") is not None
+        store.close()
+
+    def test_touched_file_not_reindexed(self, tmp_project_dir: Path, _db_dir):
+        index_project(tmp_project_dir)
+        main = tmp_project_dir / "main.py"
+        stat = main.stat()
+        os.utime(main, (stat.st_atime + 10, stat.st_mtime + 10))
+
+        info = index_project(tmp_project_dir)
+        assert info.metadata["changed_files"] == 0
+        assert info.metadata["new_chunks"] == 0
+
+        # The refreshed mtime is stored, so the next run skips hashing it
+        from memboot.indexer import get_db_path
+
+        store = MembootStore(get_db_path(tmp_project_dir))
+        assert store.get_all_file_meta()["main.py"][0] == stat.st_mtime + 10
+        store.close()
+
+    def test_touched_and_edited_files(self, tmp_project_dir: Path, _db_dir):
+        index_project(tmp_project_dir)
+        main = tmp_project_dir / "main.py"
+        stat = main.stat()
+        os.utime(main, (stat.st_atime + 10, stat.st_mtime + 10))
+        (tmp_project_dir / "notes.txt").write_text("Rewritten notes with new words.\n")
+
+        info = index_project(tmp_project_dir)
+        assert info.metadata["changed_files"] == 1
+        assert info.metadata["unchanged_files"] == 4
+
+    def test_reported_timestamp_matches_stored(self, tmp_project_dir: Path, _db_dir):
+        info = index_project(tmp_project_dir)
+        from memboot.indexer import get_db_path
+
+        store = MembootStore(get_db_path(tmp_project_dir))
+        assert store.get_meta("last_indexed") == info.last_indexed
+        store.close()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import shutil
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -10,15 +11,17 @@ import pytest
 
 from memboot.exceptions import IngestError
 from memboot.ingest.files import ingest_file
+from memboot.ingest.pdf import ingest_pdf
+from memboot.ingest.web import ingest_url
 from memboot.store import MembootStore
 
 
-@pytest.fixture
-def indexed_store(tmp_path: Path) -> tuple[Path, Path]:
-    """Create a project with a pre-fitted TF-IDF store."""
+@pytest.fixture(scope="module")
+def _tfidf_seed_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A store with pre-fitted TF-IDF state, built once per module."""
     from memboot.embedder import TfidfEmbedder
 
-    db_path = tmp_path / "test.db"
+    db_path = tmp_path_factory.mktemp("tfidf_seed") / "test.db"
     store = MembootStore(db_path)
 
     emb = TfidfEmbedder(max_features=10)
@@ -26,6 +29,14 @@ def indexed_store(tmp_path: Path) -> tuple[Path, Path]:
     store.set_meta("tfidf_state", json.dumps(emb.save_state()))
     store.set_meta("embedding_backend", "tfidf")
     store.close()
+    return db_path
+
+
+@pytest.fixture
+def indexed_store(_tfidf_seed_db: Path, tmp_path: Path) -> tuple[Path, Path]:
+    """Create a project with a private copy of the pre-fitted TF-IDF store."""
+    db_path = tmp_path / "test.db"
+    shutil.copy(_tfidf_seed_db, db_path)
 
     project = tmp_path / "proj"
     project.mkdir()
@@ -94,26 +105,18 @@ class TestIngestPdf:
             patch.dict("sys.modules", {"pdfplumber": None}),
             pytest.raises(IngestError, match="pdfplumber"),
         ):
-            from importlib import reload
-
-            import memboot.ingest.pdf
-
-            reload(memboot.ingest.pdf)
-            memboot.ingest.pdf.ingest_pdf(tmp_path / "doc.pdf", tmp_path)
+            ingest_pdf(tmp_path / "doc.pdf", tmp_path)
 
     def test_file_not_found(self, indexed_store, monkeypatch):
         project, db_path = indexed_store
         monkeypatch.setattr("memboot.ingest.pdf.get_db_path", lambda p: db_path)
 
         mock_pdfplumber = MagicMock()
-        with patch.dict("sys.modules", {"pdfplumber": mock_pdfplumber}):
-            from importlib import reload
-
-            import memboot.ingest.pdf
-
-            reload(memboot.ingest.pdf)
-            with pytest.raises(IngestError, match="File not found"):
-                memboot.ingest.pdf.ingest_pdf(project / "nope.pdf", project)
+        with (
+            patch.dict("sys.modules", {"pdfplumber": mock_pdfplumber}),
+            pytest.raises(IngestError, match="File not found"),
+        ):
+            ingest_pdf(project / "nope.pdf", project)
 
     def test_success_with_mocked_pdf(self, indexed_store, monkeypatch):
         project, db_path = indexed_store
@@ -125,7 +128,7 @@ class TestIngestPdf:
 
         # Mock pdfplumber
         mock_page = MagicMock()
-        mock_page.extract_text.return_value = "This is page one content with words."
+        mock_page.extract_text_simple.return_value = "This is page one content with words."
 
         mock_pdf = MagicMock()
         mock_pdf.__enter__ = MagicMock(return_value=mock_pdf)
@@ -136,14 +139,10 @@ class TestIngestPdf:
         mock_pdfplumber.open.return_value = mock_pdf
 
         with patch.dict("sys.modules", {"pdfplumber": mock_pdfplumber}):
-            from importlib import reload
-
-            import memboot.ingest.pdf
-
-            reload(memboot.ingest.pdf)
-            chunks = memboot.ingest.pdf.ingest_pdf(pdf_file, project)
+            chunks = ingest_pdf(pdf_file, project)
             assert len(chunks) >= 1
             assert all(c.embedding is not None for c in chunks)
+            mock_page.flush_cache.assert_called_once()
 
     def test_empty_pdf(self, indexed_store, monkeypatch):
         project, db_path = indexed_store
@@ -153,7 +152,7 @@ class TestIngestPdf:
         pdf_file.write_bytes(b"fake")
 
         mock_page = MagicMock()
-        mock_page.extract_text.return_value = ""
+        mock_page.extract_text_simple.return_value = ""
 
         mock_pdf = MagicMock()
         mock_pdf.__enter__ = MagicMock(return_value=mock_pdf)
@@ -164,12 +163,7 @@ class TestIngestPdf:
         mock_pdfplumber.open.return_value = mock_pdf
 
         with patch.dict("sys.modules", {"pdfplumber": mock_pdfplumber}):
-            from importlib import reload
-
-            import memboot.ingest.pdf
-
-            reload(memboot.ingest.pdf)
-            chunks = memboot.ingest.pdf.ingest_pdf(pdf_file, project)
+            chunks = ingest_pdf(pdf_file, project)
             assert chunks == []
 
 
@@ -179,12 +173,7 @@ class TestIngestWeb:
             patch.dict("sys.modules", {"trafilatura": None}),
             pytest.raises(IngestError, match="trafilatura"),
         ):
-            from importlib import reload
-
-            import memboot.ingest.web
-
-            reload(memboot.ingest.web)
-            memboot.ingest.web.ingest_url("https://example.com", tmp_path)
+            ingest_url("https://example.com", tmp_path)
 
     def test_success_with_mocked_web(self, indexed_store, monkeypatch):
         project, db_path = indexed_store
@@ -195,12 +184,7 @@ class TestIngestWeb:
         mock_trafilatura.extract.return_value = "Hello world content from the web page."
 
         with patch.dict("sys.modules", {"trafilatura": mock_trafilatura}):
-            from importlib import reload
-
-            import memboot.ingest.web
-
-            reload(memboot.ingest.web)
-            chunks = memboot.ingest.web.ingest_url("https://example.com", project)
+            chunks = ingest_url("https://example.com", project)
             assert len(chunks) >= 1
             assert all(c.embedding is not None for c in chunks)
 
@@ -210,14 +194,11 @@ class TestIngestWeb:
         mock_trafilatura = MagicMock()
         mock_trafilatura.fetch_url.return_value = None
 
-        with patch.dict("sys.modules", {"trafilatura": mock_trafilatura}):
-            from importlib import reload
-
-            import memboot.ingest.web
-
-            reload(memboot.ingest.web)
-            with pytest.raises(IngestError, match="Could not download"):
-                memboot.ingest.web.ingest_url("https://example.com", project)
+        with (
+            patch.dict("sys.modules", {"trafilatura": mock_trafilatura}),
+            pytest.raises(IngestError, match="Could not download"),
+        ):
+            ingest_url("https://example.com", project)
 
     def test_no_extractable_content(self, indexed_store, monkeypatch):
         project, db_path = indexed_store
@@ -226,11 +207,47 @@ class TestIngestWeb:
         mock_trafilatura.fetch_url.return_value = "<html></html>"
         mock_trafilatura.extract.return_value = ""
 
-        with patch.dict("sys.modules", {"trafilatura": mock_trafilatura}):
-            from importlib import reload
-
-            import memboot.ingest.web
-
-            reload(memboot.ingest.web)
-            with pytest.raises(IngestError, match="No extractable content"):
-                memboot.ingest.web.ingest_url("https://example.com", project)
+        with (
+            patch.dict("sys.modules", {"trafilatura": mock_trafilatura}),
+            pytest.raises(IngestError, match="No extractable content"),
+        ):
+            ingest_url("https://example.com", project)
+
+
+class TestEmbedAndStore:
+    def test_uses_configured_backend(self, tmp_path: Path):
+        import numpy as np
+
+        from memboot.embedder import _shared_embedder
+        from memboot.ingest._common import embed_and_store
+        from memboot.models import Chunk, ChunkType
+
+        store = MembootStore(tmp_path / "test.db")
+        store.set_meta("embedding_backend", "sentence-transformers")
+        fake = MagicMock()
+        fake.embed_texts.return_value = np.eye(2, 3, dtype=np.float32)
+
+        def make_chunks(prefix: str) -> list[Chunk]:
+            return [
+                Chunk(
+                    id=f"{prefix}{i}",
+                    content=f"text {i}",
+                    source_file="x",
+                    chunk_type=ChunkType.WINDOW,
+                )
+                for i in range(2)
+            ]
+
+        _shared_embedder.cache_clear()
+        try:
+            with patch("memboot.embedder.get_embedder", return_value=fake) as factory:
+                result = embed_and_store(store, make_chunks("a"))
+                embed_and_store(store, make_chunks("b"))
+        finally:
+            _shared_embedder.cache_clear()
+        # The model is built once and reused by later ingests
+        factory.assert_called_once_with("sentence-transformers")
+        assert fake.embed_texts.call_count == 2
+        assert [c.embedding for c in result] == [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+        assert store.count_chunks() == 4
+        store.close()
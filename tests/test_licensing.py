@@ -4,26 +4,27 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from memboot.licensing import (
     TIER_DEFINITIONS,
     Tier,
     TierConfig,
     _compute_check_segment,
     _find_license_key,
+    _parse_key,
     _validate_key_checksum,
     _validate_key_format,
     get_license_info,
     get_upgrade_message,
     has_feature,
     is_pro,
+    refresh_license,
 )
+from tests.conftest import _PRO_KEY
 
-
-def _make_valid_key() -> str:
-    """Generate a valid MMBT license key."""
-    body = "TEST-ABCD"
-    check = _compute_check_segment(body)
-    return f"MMBT-{body}-{check}"
+# Start every test from no license key in the environment or on disk
+pytestmark = pytest.mark.usefixtures("free_tier")
 
 
 class TestTiers:
@@ -52,37 +53,42 @@ class TestTiers:
 
 
 class TestValidateKeyFormat:
-    def test_valid_key(self):
-        assert _validate_key_format("MMBT-ABCD-EFGH-IJKL")
-
-    def test_wrong_prefix(self):
-        assert not _validate_key_format("XXXX-ABCD-EFGH-IJKL")
-
-    def test_too_few_parts(self):
-        assert not _validate_key_format("MMBT-ABCD-EFGH")
-
-    def test_too_many_parts(self):
-        assert not _validate_key_format("MMBT-ABCD-EFGH-IJKL-MNOP")
-
-    def test_lowercase_fails(self):
-        assert not _validate_key_format("MMBT-abcd-EFGH-IJKL")
-
-    def test_wrong_segment_length(self):
-        assert not _validate_key_format("MMBT-ABC-EFGH-IJKL")
-
-    def test_with_whitespace(self):
-        assert _validate_key_format("  MMBT-ABCD-EFGH-IJKL  ")
+    @pytest.mark.parametrize(
+        ("key", "expected"),
+        [
+            ("MMBT-ABCD-EFGH-IJKL", True),
+            ("XXXX-ABCD-EFGH-IJKL", False),
+            ("MMBT-ABCD-EFGH", False),
+            ("MMBT-ABCD-EFGH-IJKL-MNOP", False),
+            ("MMBT-abcd-EFGH-IJKL", False),
+            ("MMBT-ABC-EFGH-IJKL", False),
+            ("  MMBT-ABCD-EFGH-IJKL  ", True),
+            ("MMBT-TEST-ABCD-1234", True),
+            ("MMBT-ÄBCD-EFGH-IJKL", False),
+        ],
+        ids=[
+            "valid",
+            "wrong-prefix",
+            "too-few-parts",
+            "too-many-parts",
+            "lowercase",
+            "wrong-segment-length",
+            "whitespace",
+            "digit-only-segment",
+            "non-ascii",
+        ],
+    )
+    def test_validate_format(self, key: str, expected: bool):
+        assert _validate_key_format(key) is expected
 
 
 class TestValidateKeyChecksum:
     def test_valid_checksum(self):
-        key = _make_valid_key()
-        assert _validate_key_checksum(key)
+        assert _validate_key_checksum(_PRO_KEY)
 
     def test_tampered_key(self):
-        key = _make_valid_key()
         # Change the last segment
-        parts = key.split("-")
+        parts = _PRO_KEY.split("-")
         parts[3] = "ZZZZ"
         tampered = "-".join(parts)
         assert not _validate_key_checksum(tampered)
@@ -91,6 +97,14 @@ class TestValidateKeyChecksum:
         assert not _validate_key_checksum("MMBT-ABCD")
 
 
+class TestParseKey:
+    def test_splits_body_and_check(self):
+        assert _parse_key(" MMBT-TEST-ABCD-12EF\n") == ("TEST-ABCD", "12EF")
+
+    def test_malformed_key(self):
+        assert _parse_key("MMBT-ABCD-EFGH") is None
+
+
 class TestComputeCheckSegment:
     def test_deterministic(self):
         seg1 = _compute_check_segment("TEST-ABCD")
@@ -119,12 +133,10 @@ class TestFindLicenseKey:
 
     def test_env_var_empty(self, monkeypatch):
         monkeypatch.setenv("MEMBOOT_LICENSE", "")
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
         key = _find_license_key()
         assert key is None
 
     def test_file_location(self, tmp_path: Path, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
         license_file = tmp_path / ".memboot-license"
         license_file.write_text("MMBT-FILE-KEYS-HERE")
         monkeypatch.setattr(
@@ -134,28 +146,32 @@ class TestFindLicenseKey:
         key = _find_license_key()
         assert key == "MMBT-FILE-KEYS-HERE"
 
-    def test_no_key_found(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
+    def test_skips_missing_and_directory_locations(self, tmp_path: Path, monkeypatch):
+        (tmp_path / "dir-license").mkdir()
+        license_file = tmp_path / "license"
+        license_file.write_text("  MMBT-FILE-KEYS-HERE\n")
+        monkeypatch.setattr(
+            "memboot.licensing._LICENSE_LOCATIONS",
+            [str(tmp_path / "missing"), str(tmp_path / "dir-license"), str(license_file)],
+        )
+        assert _find_license_key() == "MMBT-FILE-KEYS-HERE"
+
+    def test_no_key_found(self):
         key = _find_license_key()
         assert key is None
 
 
 class TestGetLicenseInfo:
-    def test_no_key(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
+    def test_no_key(self):
         info = get_license_info()
         assert info.tier == Tier.FREE
         assert info.license_key is None
 
-    def test_valid_key(self, monkeypatch):
-        key = _make_valid_key()
-        monkeypatch.setenv("MEMBOOT_LICENSE", key)
+    def test_valid_key(self, pro_license: str):
         info = get_license_info()
         assert info.tier == Tier.PRO
         assert info.valid is True
-        assert info.license_key == key
+        assert info.license_key == pro_license
 
     def test_invalid_format(self, monkeypatch):
         monkeypatch.setenv("MEMBOOT_LICENSE", "bad-key")
@@ -169,36 +185,56 @@ class TestGetLicenseInfo:
         assert info.tier == Tier.FREE
         assert info.valid is False
 
+    def test_cached_until_env_changes(self, monkeypatch):
+        calls: list[None] = []
+
+        def fake_find() -> str:
+            calls.append(None)
+            return _PRO_KEY
+
+        monkeypatch.setattr("memboot.licensing._find_license_key", fake_find)
+        monkeypatch.setenv("MEMBOOT_LICENSE", "cache-test-1")
+        get_license_info()
+        get_license_info()
+        assert len(calls) == 1
+        monkeypatch.setenv("MEMBOOT_LICENSE", "cache-test-2")
+        get_license_info()
+        assert len(calls) == 2
+        refresh_license()
+        get_license_info()
+        assert len(calls) == 3
+
+    def test_license_file_change_is_seen(self, tmp_path: Path, monkeypatch):
+        license_file = tmp_path / "license"
+        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [str(license_file)])
+        assert get_license_info().tier == Tier.FREE
+
+        license_file.write_text(_PRO_KEY)
+        assert get_license_info().tier == Tier.PRO
+
+        license_file.unlink()
+        assert get_license_info().tier == Tier.FREE
+
 
 class TestHasFeature:
-    def test_free_feature_without_key(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
+    def test_free_feature_without_key(self):
         assert has_feature("init") is True
         assert has_feature("query") is True
 
-    def test_pro_feature_without_key(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
+    def test_pro_feature_without_key(self):
         assert has_feature("serve") is False
         assert has_feature("ingest_pdf") is False
 
-    def test_pro_feature_with_key(self, monkeypatch):
-        key = _make_valid_key()
-        monkeypatch.setenv("MEMBOOT_LICENSE", key)
+    def test_pro_feature_with_key(self, pro_license: str):
         assert has_feature("serve") is True
         assert has_feature("ingest_pdf") is True
 
 
 class TestIsPro:
-    def test_without_key(self, monkeypatch):
-        monkeypatch.delenv("MEMBOOT_LICENSE", raising=False)
-        monkeypatch.setattr("memboot.licensing._LICENSE_LOCATIONS", [])
+    def test_without_key(self):
         assert is_pro() is False
 
-    def test_with_valid_key(self, monkeypatch):
-        key = _make_valid_key()
-        monkeypatch.setenv("MEMBOOT_LICENSE", key)
+    def test_with_valid_key(self, pro_license: str):
         assert is_pro() is True
 
 
@@ -6,8 +6,14 @@ import runpy
 
 import pytest
 
+from memboot import __version__
+
 
 class TestMainModule:
-    def test_run_module(self):
-        with pytest.raises(SystemExit):
+    def test_run_module(self, monkeypatch, capsys):
+        # Only __main__.py itself is executed; memboot.cli is already imported
+        monkeypatch.setattr("sys.argv", ["memboot", "--version"])
+        with pytest.raises(SystemExit) as exc_info:
             runpy.run_module("memboot", run_name="__main__")
+        assert exc_info.value.code == 0
+        assert __version__ in capsys.readouterr().out
@@ -3,103 +3,63 @@
 from __future__ import annotations
 
 import asyncio
+import sys
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from memboot import mcp_server
 from memboot.exceptions import MembootError
 from memboot.models import Memory, MemoryType, SearchResult
+from memboot.store import MembootStore
 
 
 def _make_mock_mcp():
-    """Create mock MCP modules that capture registered handlers."""
+    """Create stand-in MCP modules that capture registered handlers."""
     captured = {}
 
-    mock_server_instance = MagicMock()
-
-    def mock_list_tools():
-        def decorator(fn):
-            captured["list_tools"] = fn
-            return fn
-
-        return decorator
-
-    def mock_call_tool():
+    def register(name):
         def decorator(fn):
-            captured["call_tool"] = fn
+            captured[name] = fn
             return fn
 
-        return decorator
+        return lambda: decorator
 
-    mock_server_instance.list_tools = mock_list_tools
-    mock_server_instance.call_tool = mock_call_tool
+    server = SimpleNamespace(list_tools=register("list_tools"), call_tool=register("call_tool"))
 
-    mock_server_cls = MagicMock(return_value=mock_server_instance)
-    mock_tool = MagicMock(side_effect=lambda **kwargs: kwargs)
-    mock_text_content = MagicMock(side_effect=lambda **kwargs: kwargs)
-
-    mock_mcp_server = MagicMock()
-    mock_mcp_server.Server = mock_server_cls
-    mock_mcp_types = MagicMock()
-    mock_mcp_types.TextContent = mock_text_content
-    mock_mcp_types.Tool = mock_tool
+    def build(**kwargs):
+        return kwargs
 
     modules = {
-        "mcp": MagicMock(),
-        "mcp.server": mock_mcp_server,
-        "mcp.types": mock_mcp_types,
+        "mcp": SimpleNamespace(),
+        "mcp.server": SimpleNamespace(Server=lambda name: server),
+        "mcp.types": SimpleNamespace(TextContent=build, Tool=build),
     }
-    return modules, captured, mock_server_instance
+    return modules, captured, server
 
 
 class TestCreateMcpServer:
-    def test_import_error(self):
-        with (
-            patch.dict("sys.modules", {"mcp": None, "mcp.server": None, "mcp.types": None}),
-            pytest.raises(MembootError, match="MCP server requires"),
-        ):
-            from importlib import reload
-
-            import memboot.mcp_server
-
-            reload(memboot.mcp_server)
-            memboot.mcp_server.create_mcp_server(Path("."))
+    def test_import_error(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "mcp", None)
+        with pytest.raises(MembootError, match="MCP server requires"):
+            mcp_server.create_mcp_server(Path("."))
 
     def test_creates_server_with_mocked_mcp(self):
         modules, captured, _ = _make_mock_mcp()
         with patch.dict("sys.modules", modules):
-            from importlib import reload
-
-            import memboot.mcp_server
-
-            reload(memboot.mcp_server)
-            server = memboot.mcp_server.create_mcp_server(Path("/tmp/proj"))
+            server = mcp_server.create_mcp_server(Path("/tmp/proj"))
             assert server is not None
             assert "list_tools" in captured
             assert "call_tool" in captured
 
 
 class TestRunServer:
-    def test_import_error(self):
-        with (
-            patch.dict(
-                "sys.modules",
-                {
-                    "mcp": None,
-                    "mcp.server": None,
-                    "mcp.server.stdio": None,
-                    "mcp.types": None,
-                },
-            ),
-            pytest.raises(MembootError, match="MCP server requires"),
-        ):
-            from importlib import reload
-
-            import memboot.mcp_server
-
-            reload(memboot.mcp_server)
-            asyncio.run(memboot.mcp_server.run_server(Path(".")))
+    def test_import_error(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "mcp", None)
+        with pytest.raises(MembootError, match="MCP server requires"):
+            mcp_server._require_mcp()
 
     def test_run_server_calls_stdio(self):
         modules, _, mock_server = _make_mock_mcp()
@@ -127,12 +87,7 @@ class TestRunServer:
 
         modules["mcp.server.stdio"] = mock_stdio
         with patch.dict("sys.modules", modules):
-            from importlib import reload
-
-            import memboot.mcp_server
-
-            reload(memboot.mcp_server)
-            asyncio.run(memboot.mcp_server.run_server(Path("/tmp")))
+            asyncio.run(mcp_server.run_server(Path("/tmp")))
             mock_server.run.assert_called_once()
 
 
@@ -141,16 +96,13 @@ class TestMcpToolHandlers:
 
     @pytest.fixture
     def _handlers(self):
+        # The mcp imports are function-local, so patching sys.modules is enough;
+        # each test still gets a fresh server and its own store cache
         modules, captured, _ = _make_mock_mcp()
         with patch.dict("sys.modules", modules):
-            from importlib import reload
-
-            import memboot.mcp_server
-
-            reload(memboot.mcp_server)
-            memboot.mcp_server.create_mcp_server(Path("/tmp/proj"))
-        # Return both captured handlers and the reloaded module for patching
-        return captured, memboot.mcp_server
+            mcp_server.create_mcp_server(Path("/tmp/proj"))
+        # Return both captured handlers and the module for patching
+        return captured, mcp_server
 
     def test_list_tools_returns_three(self, _handlers):
         captured, _ = _handlers
@@ -171,6 +123,18 @@ class TestMcpToolHandlers:
         assert len(result) == 1
         assert "main.py" in result[0]["text"]
 
+    def test_query_formats_results(self, _handlers):
+        captured, mod = _handlers
+        mock_results = [
+            SearchResult(content="def foo(): pass", source="main.py", score=0.95),
+            SearchResult(content="x = 1", source="util.py", score=0.5),
+        ]
+        with patch.object(mod, "search", return_value=mock_results):
+            result = asyncio.run(captured["call_tool"]("query_memory", {"query": "foo"}))
+        assert result[0]["text"] == (
+            "**main.py** (score: 0.950)\ndef foo(): pass\n\n**util.py** (score: 0.500)\nx = 1"
+        )
+
     def test_call_query_memory_empty(self, _handlers):
         captured, mod = _handlers
         with patch.object(mod, "search", return_value=[]):
@@ -215,3 +179,28 @@ class TestMcpToolHandlers:
         captured, _ = _handlers
         result = asyncio.run(captured["call_tool"]("nonexistent", {}))
         assert "Unknown tool" in result[0]["text"]
+
+    def test_tool_calls_share_one_store(self, _handlers, tmp_path: Path):
+        captured, mod = _handlers
+        db_path = tmp_path / "proj.db"
+        MembootStore(db_path).close()
+        with (
+            patch.object(mod, "get_db_path", return_value=db_path),
+            patch.object(mod, "search", return_value=[]) as mock_search,
+            patch.object(mod, "build_context", return_value="ctx") as mock_context,
+        ):
+            asyncio.run(captured["call_tool"]("query_memory", {"query": "a"}))
+            asyncio.run(captured["call_tool"]("get_context", {"query": "b"}))
+        store = mock_search.call_args.kwargs["store"]
+        assert isinstance(store, MembootStore)
+        assert mock_context.call_args.kwargs["store"] is store
+        store.close()
+
+    def test_no_store_before_index_exists(self, _handlers, tmp_path: Path):
+        captured, mod = _handlers
+        with (
+            patch.object(mod, "get_db_path", return_value=tmp_path / "missing.db"),
+            patch.object(mod, "search", return_value=[]) as mock_search,
+        ):
+            asyncio.run(captured["call_tool"]("query_memory", {"query": "a"}))
+        assert mock_search.call_args.kwargs["store"] is None
@@ -6,40 +6,32 @@ from pathlib import Path
 
 import pytest
 
+from memboot.indexer import get_db_path
 from memboot.memory import delete_memory, list_memories, remember
 from memboot.models import MemoryType
+from memboot.store import MembootStore
 
 
-@pytest.fixture
-def indexed_project(tmp_path: Path, monkeypatch):
-    """Create and index a project, return (project_path, db_path)."""
-    db_dir = tmp_path / ".memboot"
-    db_path = db_dir / "proj.db"
-
-    monkeypatch.setattr(
-        "memboot.indexer.get_db_path",
-        lambda p: db_path,
-    )
-    monkeypatch.setattr(
-        "memboot.memory.get_db_path",
-        lambda p: db_path,
-    )
+@pytest.fixture(autouse=True)
+def _memboot_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give every test its own index directory, so tests share no state."""
+    monkeypatch.setenv("MEMBOOT_HOME", str(tmp_path / ".memboot"))
 
-    project = tmp_path / "proj"
-    project.mkdir()
-    (project / "test.py").write_text("def hello(): return 'hello'\n")
 
-    from memboot.indexer import index_project
+@pytest.fixture
+def indexed_project(pre_indexed_project: Path):
+    """The indexed sample project with a private copy of its database.
 
-    index_project(project)
-    return project, db_path
+    Returns (project_path, db_path).
+    """
+    return pre_indexed_project, get_db_path(pre_indexed_project.resolve())
 
 
 class TestRemember:
     def test_stores_memory(self, indexed_project):
         project, db_path = indexed_project
         mem = remember("Important decision", MemoryType.DECISION, project)
-        assert mem.id
+        assert len(mem.id) == 32
         assert mem.content == "Important decision"
         assert mem.memory_type == MemoryType.DECISION
 
@@ -54,14 +46,8 @@ class TestRemember:
         mem = remember("Tagged note", MemoryType.NOTE, project, tags=["arch", "db"])
         assert mem.tags == ["arch", "db"]
 
-    def test_without_existing_state(self, tmp_path: Path, monkeypatch):
+    def test_without_existing_state(self, tmp_path: Path):
         """When no TF-IDF state exists, should fit on just the content."""
-        db_dir = tmp_path / ".memboot"
-        db_path = db_dir / "proj.db"
-        monkeypatch.setattr(
-            "memboot.memory.get_db_path",
-            lambda p: db_path,
-        )
         project = tmp_path / "proj"
         project.mkdir()
 
@@ -86,12 +72,15 @@ class TestListMemories:
         assert len(notes) == 1
         assert notes[0].memory_type == MemoryType.NOTE
 
-    def test_empty_project(self, tmp_path: Path, monkeypatch):
-        db_path = tmp_path / "nonexistent.db"
-        monkeypatch.setattr(
-            "memboot.memory.get_db_path",
-            lambda p: db_path,
-        )
+    def test_with_open_store(self, indexed_project, tmp_path: Path):
+        project, db_path = indexed_project
+        store = MembootStore(db_path)
+        remember("Note 1", MemoryType.NOTE, project, store=store)
+        assert len(list_memories(tmp_path / "elsewhere", store=store)) == 1
+        assert store.count_memories() == 1  # still open
+        store.close()
+
+    def test_empty_project(self, tmp_path: Path):
         mems = list_memories(tmp_path)
         assert mems == []
 
@@ -108,11 +97,14 @@ class TestDeleteMemory:
         result = delete_memory("nonexistent-id", project)
         assert result is False
 
-    def test_missing_project(self, tmp_path: Path, monkeypatch):
-        db_path = tmp_path / "nonexistent.db"
-        monkeypatch.setattr(
-            "memboot.memory.get_db_path",
-            lambda p: db_path,
-        )
+    def test_with_open_store(self, indexed_project, tmp_path: Path):
+        project, db_path = indexed_project
+        store = MembootStore(db_path)
+        mem = remember("To delete", MemoryType.NOTE, project, store=store)
+        assert delete_memory(mem.id, tmp_path / "elsewhere", store=store) is True
+        assert store.count_memories() == 0  # still open
+        store.close()
+
+    def test_missing_project(self, tmp_path: Path):
         result = delete_memory("any-id", tmp_path)
         assert result is False
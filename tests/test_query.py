@@ -9,27 +9,29 @@ from unittest.mock import patch
 import numpy as np
 import pytest
 
-from memboot.embedder import TfidfEmbedder
+from memboot.embedder import TfidfEmbedder, load_tfidf_embedder
 from memboot.exceptions import QueryError
 from memboot.models import Memory, MemoryType
-from memboot.query import _restore_embedder, cosine_similarity, search
+from memboot.query import _restore_embedder, _top_k_indices, search
 from memboot.store import MembootStore
 
 
-class TestCosineSimilarity:
-    def test_identical_vectors(self):
-        v = np.array([1.0, 0.0, 0.0], dtype=np.float32)
-        assert abs(cosine_similarity(v, v) - 1.0) < 1e-5
+class TestTopKIndices:
+    def test_best_first(self):
+        scores = np.array([0.1, 0.9, 0.5, 0.7], dtype=np.float32)
+        assert _top_k_indices(scores, 2).tolist() == [1, 3]
 
-    def test_orthogonal_vectors(self):
-        a = np.array([1.0, 0.0, 0.0], dtype=np.float32)
-        b = np.array([0.0, 1.0, 0.0], dtype=np.float32)
-        assert abs(cosine_similarity(a, b)) < 1e-5
+    def test_ties_keep_input_order(self):
+        scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1], dtype=np.float32)
+        assert _top_k_indices(scores, 3).tolist() == [1, 0, 2]
 
-    def test_opposite_vectors(self):
-        a = np.array([1.0, 0.0], dtype=np.float32)
-        b = np.array([-1.0, 0.0], dtype=np.float32)
-        assert cosine_similarity(a, b) < 0
+    def test_k_exceeds_size(self):
+        scores = np.array([0.2, 0.8], dtype=np.float32)
+        assert _top_k_indices(scores, 10).tolist() == [1, 0]
+
+    def test_empty(self):
+        assert _top_k_indices(np.empty(0, dtype=np.float32), 5).size == 0
+        assert _top_k_indices(np.ones(3, dtype=np.float32), 0).size == 0
 
 
 class TestRestoreEmbedder:
@@ -81,10 +83,7 @@ class TestSearch:
 
     def test_search_returns_results(self, tmp_path: Path, monkeypatch):
         db_dir = tmp_path / ".memboot"
-        monkeypatch.setattr(
-            "memboot.indexer.Path.expanduser",
-            lambda self: db_dir if str(self) == "~/.memboot" else Path.home(),
-        )
+        monkeypatch.setenv("MEMBOOT_HOME", str(db_dir))
         monkeypatch.setattr(
             "memboot.query.get_db_path",
             lambda p: db_dir / f"{p.name}.db",
@@ -103,6 +102,23 @@ class TestSearch:
         assert len(results) >= 1
         assert all(r.score >= 0 for r in results)
 
+    def test_search_with_open_store(self, tmp_path: Path):
+        db_path = tmp_path / "proj.db"
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "test.py").write_text("def hello(): return 'hello'\n")
+        with patch("memboot.indexer.get_db_path", lambda p: db_path):
+            from memboot.indexer import index_project
+
+            index_project(project)
+
+        store = MembootStore(db_path)
+        # The given store is used directly and stays open for reuse
+        assert search("hello", tmp_path / "elsewhere", store=store)
+        assert search("hello", tmp_path / "elsewhere", store=store)
+        assert store.count_chunks() > 0
+        store.close()
+
     def test_no_index_raises(self, tmp_path: Path, monkeypatch):
         project = tmp_path / "no_index"
         project.mkdir()
@@ -151,8 +167,8 @@ class TestSearch:
 
         # Add a memory
         store = MembootStore(db_path)
-        emb_state = store.get_meta("tfidf_state")
-        emb = TfidfEmbedder.from_state(json.loads(emb_state))
+        emb = load_tfidf_embedder(store)
+        assert emb is not None
         vec = emb.embed_text("test memory")
         mem = Memory(
             id="m1",
@@ -181,8 +197,8 @@ class TestSearch:
 
         # Add a memory with embedding
         store = MembootStore(db_path)
-        emb_state = store.get_meta("tfidf_state")
-        emb = TfidfEmbedder.from_state(json.loads(emb_state))
+        emb = load_tfidf_embedder(store)
+        assert emb is not None
         vec = emb.embed_text("hello world note")
         mem = Memory(
             id="m1",
@@ -7,6 +7,7 @@ from pathlib import Path
 import numpy as np
 import pytest
 
+from memboot.exceptions import StoreError
 from memboot.models import Chunk, ChunkType, Memory, MemoryType
 from memboot.store import MembootStore
 
@@ -68,6 +69,42 @@ class TestStoreInit:
         mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
         assert mode == "wal"
 
+    def test_connection_pragmas(self, store: MembootStore):
+        conn = store._get_conn()
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_readonly(self, store: MembootStore, tmp_db_path: Path):
+        store.add_chunks([_make_chunk("c1")])
+        ro = MembootStore(tmp_db_path, readonly=True)
+        assert ro.count_chunks() == 1
+        assert ro.get_chunk_embedding_matrix()[0] == ["c1"]
+        with pytest.raises(StoreError):
+            ro.add_chunks([_make_chunk("c2")])
+        ro.close()
+
+    def test_readonly_missing_db(self, tmp_path: Path):
+        ro = MembootStore(tmp_path / "missing" / "test.db", readonly=True)
+        with pytest.raises(StoreError, match="read-only"):
+            ro.count_chunks()
+        assert not (tmp_path / "missing").exists()
+
+    def test_lookup_indexes(self, store: MembootStore):
+        conn = store._get_conn()
+        names = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+        assert {
+            "idx_chunks_source_file",
+            "idx_memories_type_created",
+            "idx_memories_created",
+        } <= names
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM chunks WHERE source_file = ?", ("a.py",)
+        ).fetchall()
+        assert "idx_chunks_source_file" in str(plan)
+
 
 class TestChunkOps:
     def test_add_and_count(self, store: MembootStore):
@@ -97,6 +134,19 @@ class TestChunkOps:
         results = store.get_chunks_by_file("a.py")
         assert len(results) == 2
 
+    def test_get_chunks(self, store: MembootStore):
+        store.add_chunks([_make_chunk("c1"), _make_chunk("c2")])
+        found = store.get_chunks(["c1", "c2", "missing"])
+        assert set(found) == {"c1", "c2"}
+        assert found["c1"].embedding is not None
+
+    def test_get_chunks_without_embeddings(self, store: MembootStore):
+        store.add_chunks([_make_chunk("c1", source_file="a.py")])
+        assert store.get_chunks(["c1"], include_embeddings=False)["c1"].embedding is None
+        (chunk,) = store.get_chunks_by_file("a.py", include_embeddings=False)
+        assert chunk.embedding is None
+        assert chunk.content == "def foo(): pass"
+
     def test_clear_chunks(self, store: MembootStore):
         store.add_chunks([_make_chunk("c1"), _make_chunk("c2")])
         deleted = store.clear_chunks()
@@ -112,6 +162,77 @@ class TestChunkOps:
         assert chunk_id == "c1"
         np.testing.assert_array_almost_equal(arr, np.array(emb, dtype=np.float32))
 
+    def test_get_chunk_embedding_matrix(self, store: MembootStore):
+        store.add_chunks(
+            [
+                _make_chunk("c1", embedding=[1.0, 2.0, 3.0]),
+                _make_chunk("c2", embedding=[4.0, 5.0, 6.0]),
+            ]
+        )
+        ids, matrix = store.get_chunk_embedding_matrix()
+        assert matrix.dtype == np.float32
+        assert matrix.shape == (2, 3)
+        rows = dict(zip(ids, matrix.tolist(), strict=True))
+        assert rows == {"c1": [1.0, 2.0, 3.0], "c2": [4.0, 5.0, 6.0]}
+
+    def test_iter_chunk_embeddings(self, store: MembootStore):
+        store.add_chunks([_make_chunk("c1", embedding=[1.0, 2.0])])
+        it = store.iter_chunk_embeddings()
+        assert iter(it) is it
+        ((chunk_id, arr),) = list(it)
+        assert chunk_id == "c1"
+        assert arr.tolist() == [1.0, 2.0]
+
+    def test_embedding_matrix_inside_transaction(self, store: MembootStore):
+        with store.transaction():
+            store.add_chunks([_make_chunk("c1", embedding=[1.0, 2.0])])
+            ids, matrix = store.get_chunk_embedding_matrix()
+            assert ids == ["c1"]
+        assert store.count_chunks() == 1
+
+    def test_get_chunk_embedding_matrix_empty(self, store: MembootStore):
+        ids, matrix = store.get_chunk_embedding_matrix()
+        assert ids == []
+        assert matrix.shape == (0, 0)
+
+    def test_get_chunk_embedding_matrix_dim_mismatch(self, store: MembootStore):
+        store.add_chunks(
+            [
+                _make_chunk("c1", embedding=[1.0, 2.0, 3.0]),
+                _make_chunk("c2", embedding=[1.0, 2.0]),
+            ]
+        )
+        with pytest.raises(StoreError, match="dimension mismatch"):
+            store.get_chunk_embedding_matrix()
+
+    def test_embedding_matrix_cached_until_write(self, store: MembootStore):
+        store.add_chunks([_make_chunk("c1", embedding=[1.0, 0.0, 0.0])])
+        ids, matrix = store.get_chunk_embedding_matrix()
+        assert store.get_chunk_embedding_matrix()[1] is matrix
+        assert not matrix.flags.writeable
+
+        store.add_chunks([_make_chunk("c2", embedding=[0.0, 1.0, 0.0])])
+        ids, matrix = store.get_chunk_embedding_matrix()
+        assert sorted(ids) == ["c1", "c2"]
+
+        store.clear_chunks()
+        assert store.get_chunk_embedding_matrix()[0] == []
+
+    def test_embedding_matrix_sees_other_connections(self, store: MembootStore, tmp_db_path: Path):
+        store.add_chunks([_make_chunk("c1", embedding=[1.0, 0.0, 0.0])])
+        assert len(store.get_chunk_embedding_matrix()[0]) == 1
+
+        other = MembootStore(tmp_db_path)
+        other.add_chunks([_make_chunk("c2", embedding=[0.0, 1.0, 0.0])])
+        other.close()
+        assert len(store.get_chunk_embedding_matrix()[0]) == 2
+
+    def test_embedding_matrix_cache_cleared_on_reset(self, store: MembootStore):
+        store.add_chunks([_make_chunk("c1", embedding=[1.0, 0.0, 0.0])])
+        store.get_chunk_embedding_matrix()
+        store.reset()
+        assert store.get_chunk_embedding_matrix()[0] == []
+
     def test_numpy_blob_roundtrip(self, store: MembootStore):
         original = [0.123456, 0.789012, 0.345678]
         store.add_chunks([_make_chunk("c1", embedding=original)])
@@ -120,6 +241,31 @@ class TestChunkOps:
         assert chunk.embedding is not None
         np.testing.assert_array_almost_equal(chunk.embedding, original, decimal=5)
 
+    def test_hydrated_embedding_is_float_list(self, store: MembootStore):
+        store.add_chunks([_make_chunk("c1", embedding=[0.5, 0.25])])
+        chunk = store.get_chunk("c1")
+        assert chunk is not None
+        assert chunk.embedding == [0.5, 0.25]
+        assert all(type(x) is float for x in chunk.embedding)
+
+    def test_add_chunks_failure_rolls_back(self, store: MembootStore):
+        bad = Chunk.model_construct(**{**_make_chunk("c2").model_dump(), "content": None})
+        with pytest.raises(StoreError, match="Failed to add chunk c2"):
+            store.add_chunks([_make_chunk("c1"), bad])
+        store.set_meta("key", "value")  # a later write must not commit the partial batch
+        assert store.count_chunks() == 0
+
+    def test_add_chunks_with_matrix(self, store: MembootStore):
+        matrix = np.array([[1.0, 0.0, 0.0], [0.0, 0.5, 0.5]], dtype=np.float64)
+        store.add_chunks([_make_chunk("c1"), _make_chunk("c2")], matrix)
+        stored = dict(store.get_all_chunk_embeddings())
+        np.testing.assert_array_equal(stored["c1"], matrix[0].astype(np.float32))
+        np.testing.assert_array_equal(stored["c2"], matrix[1].astype(np.float32))
+
+    def test_add_chunks_matrix_row_mismatch(self, store: MembootStore):
+        with pytest.raises(StoreError, match="2 rows for 1 chunks"):
+            store.add_chunks([_make_chunk("c1")], np.zeros((2, 3), dtype=np.float32))
+
     def test_replace_on_duplicate_id(self, store: MembootStore):
         store.add_chunks([_make_chunk("c1", content="old")])
         store.add_chunks([_make_chunk("c1", content="new")])
@@ -181,6 +327,33 @@ class TestMemoryOps:
         assert deleted == 2
         assert store.count_memories() == 0
 
+    def test_add_memories(self, store: MembootStore):
+        added = store.add_memories([_make_memory("m1"), _make_memory("m2", tags=["x"])])
+        assert added == 2
+        assert store.count_memories() == 2
+        mem = store.get_memory("m2")
+        assert mem is not None
+        assert mem.tags == ["x"]
+
+    def test_add_memories_failure_rolls_back(self, store: MembootStore):
+        bad = Memory.model_construct(**{**_make_memory("m2").model_dump(), "content": None})
+        with pytest.raises(StoreError, match="Failed to add memory m2"):
+            store.add_memories([_make_memory("m1"), bad])
+        assert store.count_memories() == 0
+
+    def test_get_memories(self, store: MembootStore):
+        store.add_memories([_make_memory("m1"), _make_memory("m2")])
+        found = store.get_memories(["m2", "missing"], include_embeddings=False)
+        assert list(found) == ["m2"]
+        assert found["m2"].embedding is None
+        assert store.get_memories([]) == {}
+
+    def test_list_memories_without_embeddings(self, store: MembootStore):
+        store.add_memory(_make_memory("m1", tags=["t"]))
+        (mem,) = store.list_memories(include_embeddings=False)
+        assert mem.embedding is None
+        assert mem.tags == ["t"]
+
     def test_get_all_memory_embeddings(self, store: MembootStore):
         emb = [0.7, 0.8, 0.9]
         store.add_memory(_make_memory("m1", embedding=emb))
@@ -190,6 +363,12 @@ class TestMemoryOps:
         assert mem_id == "m1"
         np.testing.assert_array_almost_equal(arr, np.array(emb, dtype=np.float32))
 
+    def test_get_memory_embedding_matrix(self, store: MembootStore):
+        store.add_memory(_make_memory("m1", embedding=[0.7, 0.8, 0.9]))
+        ids, matrix = store.get_memory_embedding_matrix()
+        assert ids == ["m1"]
+        np.testing.assert_array_almost_equal(matrix, [[0.7, 0.8, 0.9]])
+
     def test_memory_tags_roundtrip(self, store: MembootStore):
         store.add_memory(_make_memory("m1", tags=["a", "b"]))
         mem = store.get_memory("m1")
@@ -210,6 +389,19 @@ class TestMetaOps:
         store.set_meta("key", "new")
         assert store.get_meta("key") == "new"
 
+    def test_blob_roundtrip(self, store: MembootStore):
+        store.set_meta_blob("bin", b"\x00\x01binary")
+        assert store.get_meta_blob("bin") == b"\x00\x01binary"
+        store.set_meta("text", "value")
+        assert store.get_meta_blob("text") is None
+        assert store.get_meta_blob("missing") is None
+
+    def test_delete_meta(self, store: MembootStore):
+        store.set_meta("key", "value")
+        assert store.delete_meta("key") is True
+        assert store.get_meta("key") is None
+        assert store.delete_meta("key") is False
+
 
 class TestFileMetaOps:
     def test_set_and_get_all(self, store: MembootStore):
@@ -224,6 +416,32 @@ class TestFileMetaOps:
     def test_get_all_empty(self, store: MembootStore):
         assert store.get_all_file_meta() == {}
 
+    def test_set_file_meta_many(self, store: MembootStore):
+        store.set_file_meta_many([("a.py", 1000.0, 200, 5, "h1"), ("b.py", 2000.0, 300, 3, None)])
+        assert store.get_all_file_meta() == {
+            "a.py": (1000.0, 200, 5),
+            "b.py": (2000.0, 300, 3),
+        }
+        assert store.get_file_hashes() == {"a.py": "h1"}
+
+    def test_adds_hash_column_to_old_schema(self, tmp_db_path: Path):
+        import sqlite3
+
+        conn = sqlite3.connect(tmp_db_path)
+        conn.execute(
+            "CREATE TABLE file_meta (path TEXT PRIMARY KEY, mtime REAL NOT NULL,"
+            " size INTEGER NOT NULL, chunk_count INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute("INSERT INTO file_meta VALUES ('a.py', 1.0, 2, 3)")
+        conn.commit()
+        conn.close()
+
+        store = MembootStore(tmp_db_path)
+        assert store.get_all_file_meta() == {"a.py": (1.0, 2, 3)}
+        store.set_file_meta("a.py", 1.0, 2, 3, "abc")
+        assert store.get_file_hashes() == {"a.py": "abc"}
+        store.close()
+
     def test_upsert(self, store: MembootStore):
         store.set_file_meta("a.py", 1000.0, 200, 5)
         store.set_file_meta("a.py", 3000.0, 400, 10)
@@ -260,6 +478,19 @@ class TestFileMetaOps:
     def test_delete_chunks_by_file_none(self, store: MembootStore):
         assert store.delete_chunks_by_file("nonexistent") == 0
 
+    def test_delete_chunks_by_files(self, store: MembootStore, monkeypatch):
+        monkeypatch.setattr("memboot.store._IN_BATCH", 2)  # exercise batching
+        store.add_chunks([_make_chunk(f"c{i}", source_file=f"{i % 4}.py") for i in range(8)])
+        assert store.delete_chunks_by_files(["0.py", "1.py", "2.py", "missing.py"]) == 6
+        assert store.count_chunks() == 2
+        assert store.delete_chunks_by_files([]) == 0
+
+    def test_delete_file_metas(self, store: MembootStore):
+        store.set_file_meta("a.py", 1000.0, 200, 5)
+        store.set_file_meta("b.py", 2000.0, 300, 3)
+        assert store.delete_file_metas(["a.py", "missing.py"]) == 1
+        assert list(store.get_all_file_meta()) == ["b.py"]
+
     def test_clear_chunks_also_clears_file_meta(self, store: MembootStore):
         store.add_chunks([_make_chunk("c1")])
         store.set_file_meta("a.py", 1000.0, 200, 5)
@@ -272,6 +503,40 @@ class TestFileMetaOps:
         assert store.get_all_file_meta() == {}
 
 
+class TestTransaction:
+    def test_commits_on_success(self, store: MembootStore, tmp_db_path: Path):
+        with store.transaction():
+            store.add_chunks([_make_chunk("c1")])
+            store.set_meta("k", "v")
+        other = MembootStore(tmp_db_path)
+        assert other.count_chunks() == 1
+        assert other.get_meta("k") == "v"
+        other.close()
+
+    def test_rolls_back_on_error(self, store: MembootStore):
+        with pytest.raises(RuntimeError), store.transaction():
+            store.add_chunks([_make_chunk("c1")])
+            raise RuntimeError("boom")
+        assert store.count_chunks() == 0
+
+    def test_rollback_drops_cached_matrix(self, store: MembootStore):
+        with pytest.raises(RuntimeError), store.transaction():
+            store.add_chunks([_make_chunk("c1")])
+            assert store.get_chunk_embedding_matrix()[0] == ["c1"]
+            raise RuntimeError("boom")
+        assert store.count_chunks() == 0
+        ids, matrix = store.get_chunk_embedding_matrix()
+        assert ids == []
+        assert matrix.shape[0] == 0
+
+    def test_nested_joins_outer(self, store: MembootStore):
+        with pytest.raises(RuntimeError), store.transaction():
+            with store.transaction():
+                store.set_meta("k", "v")
+            raise RuntimeError("boom")
+        assert store.get_meta("k") is None
+
+
 class TestLifecycle:
     def test_reset_clears_all(self, store: MembootStore):
         store.add_chunks([_make_chunk("c1")])
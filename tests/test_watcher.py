@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import threading
 import time
 from pathlib import Path
@@ -31,17 +32,41 @@ class TestWatchProjectImportError:
             watcher_mod.watch_project(Path("."))
 
 
+class TestRelevanceFilter:
+    def _filter(self, tmp_path: Path):
+        from memboot.models import MembootConfig
+        from memboot.watcher import _relevance_filter
+
+        return _relevance_filter(tmp_path, MembootConfig())
+
+    def test_indexed_extension(self, tmp_path: Path):
+        is_relevant = self._filter(tmp_path)
+        assert is_relevant(str(tmp_path / "src" / "main.py"))
+        assert is_relevant(str(tmp_path / "README.MD"))
+
+    def test_other_extension(self, tmp_path: Path):
+        assert not self._filter(tmp_path)(str(tmp_path / "debug.log"))
+
+    def test_ignored_directory(self, tmp_path: Path):
+        assert not self._filter(tmp_path)(str(tmp_path / "node_modules" / "pkg" / "x.py"))
+
+    def test_outside_project(self, tmp_path: Path):
+        is_relevant = self._filter(tmp_path / "proj")
+        assert not is_relevant(str(tmp_path / "other" / "main.py"))
+        assert not is_relevant(str(tmp_path / "proj2" / "main.py"))
+
+
 class TestWatcherHandler:
     """Test the file event handler logic."""
 
-    def test_relevant_file_triggers_reindex(self, tmp_path: Path):
+    def test_relevant_file_triggers_reindex(self, tmp_path: Path, monkeypatch):
         from memboot.watcher import watch_project
 
         project = tmp_path / "proj"
         project.mkdir()
         (project / "main.py").write_text('def hello(): return "hi"\n')
 
-        db_dir = tmp_path / ".memboot"
+        monkeypatch.setenv("MEMBOOT_HOME", str(tmp_path / ".memboot"))
         reindex_called = threading.Event()
         reindex_info = {}
 
@@ -50,18 +75,13 @@ class TestWatcherHandler:
             reindex_called.set()
 
         def run_watcher():
-            try:
-                with patch(
-                    "memboot.indexer.Path.expanduser",
-                    lambda self: db_dir if str(self) == "~/.memboot" else Path.home(),
-                ):
-                    watch_project(
-                        project,
-                        debounce=0.3,
-                        on_reindex=on_reindex,
-                    )
-            except Exception:
-                pass  # Watcher thread — errors expected during test teardown
+            # Watcher thread — errors expected during test teardown
+            with contextlib.suppress(Exception):
+                watch_project(
+                    project,
+                    debounce=0.3,
+                    on_reindex=on_reindex,
+                )
 
         t = threading.Thread(target=run_watcher, daemon=True)
         t.start()
@@ -103,6 +123,32 @@ class TestWatcherHandler:
 
         assert not reindex_called.is_set()
 
+    def test_rename_into_place_triggers_reindex(self, tmp_path: Path):
+        """An atomic save (write temp file, rename over target) is picked up."""
+        from memboot.watcher import watch_project
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "main.py").write_text("x = 1\n")
+
+        reindex_called = threading.Event()
+
+        t = threading.Thread(
+            target=lambda: watch_project(
+                project, debounce=0.2, on_reindex=lambda info: reindex_called.set()
+            ),
+            daemon=True,
+        )
+        t.start()
+        time.sleep(1.0)
+
+        tmp_file = project / "main.py.tmp"
+        tmp_file.write_text("x = 2\n")
+        time.sleep(0.5)  # let the temp file's own (irrelevant) events settle
+        tmp_file.replace(project / "main.py")
+
+        assert reindex_called.wait(timeout=10.0), "Reindex callback was not called"
+
     def test_debounce_coalesces_changes(self, tmp_path: Path):
         """Multiple rapid changes should result in a single reindex."""
         from memboot.watcher import watch_project